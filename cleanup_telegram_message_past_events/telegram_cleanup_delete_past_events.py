@@ -114,8 +114,9 @@ The script will:
 
 from telethon import TelegramClient
 import pandas as pd
-from dateutil.parser import parse
+import asyncio
 import re
+from dataclasses import dataclass
 from datetime import datetime
 from dotenv import load_dotenv
 import os
@@ -123,6 +124,11 @@ import sys
 import argparse
 from pathlib import Path
 
+try:
+    import ahocorasick  # Optional: single-pass keyword matching (pip install pyahocorasick)
+except ImportError:
+    ahocorasick = None
+
 # Load environment variables
 load_dotenv()
 
@@ -149,171 +155,315 @@ api_hash = TELEGRAM_API_HASH
 LIVE_CHANNEL = os.getenv('TELEGRAM_LIVE_CHANNEL', 'raveinbelgium')
 TEST_CHANNEL = os.getenv('TELEGRAM_TEST_CHANNEL', 'testchannel1234123434')
 
+# Messages per classification batch (classified off the event loop while the next batch downloads)
+SCAN_BATCH_SIZE = 200
+
+# Max message IDs per delete request (Telegram's channels.deleteMessages limit)
+DELETE_BATCH_SIZE = 100
+
+# Columns collected for every event found during a scan
+EVENT_COLUMNS = ('event_date', 'title', 'url', 'message_id', 'is_weekly_summary', 'is_daily_summary')
+
 # Get script directory for storing session file
 SCRIPT_DIR = Path(__file__).parent
 
 # Initialize Telegram client (session file in script directory)
 client = TelegramClient(str(SCRIPT_DIR / 'cleanup_session'), api_id, api_hash)
 
+# Precompiled patterns (compiled once at import, each run at most once per message)
+_WEEKLY_RANGE_RE = re.compile(
+    r'\((?P<start_day>\d{1,2})\s+(?P<start_month>[A-Z]{3})\s*-\s*'
+    r'(?P<end_day>\d{1,2})\s+(?P<end_month>[A-Z]{3})\)'
+)
+_FIRSTLINE_DATE_RE = re.compile(r'(?P<day>\d{1,2})\s*(?P<month>[A-Za-zÀ-ÿ]{3,})')
+_DIGIT_RE = re.compile(r'\d')
+
+# Marks a lazily computed _Msg field that hasn't been evaluated yet
+_UNSET = object()
+
+# Summary detection keywords (already lowercased where matched against lowered text)
+_WEEKLY_PATTERNS_LOWER = (
+    "here's what's going on",
+    "this week",
+    "good evening",
+    "what's up this",
+    "weekend",
+    "upcoming events",
+)
+_DAILY_INDICATORS = (
+    "today", "tonight", "this evening", "this afternoon",
+    "happening now", "later today", "daily", "today's",
+)
+_DAILY_SCRIPT_PATTERNS = ("• **", "   Facebook", "   Tickets", "   Ticketswap", "★ <a href=")
+_DAILY_EMOJIS = ("✨", "🔥", "🎉", "🎊", "💫", "⭐")
+
+# Keyword groups matched against the lowercased / raw message text
+_LOWER_KEYWORDS = {'weekly': _WEEKLY_PATTERNS_LOWER, 'today': _DAILY_INDICATORS}
+_RAW_KEYWORDS = {'script': _DAILY_SCRIPT_PATTERNS, 'emoji': _DAILY_EMOJIS}
+
+# Month name lookup (lowercase); names not listed here are not parsed as dates
+_MONTHS = {
+    'jan': 1, 'january': 1, 'janvier': 1,
+    'feb': 2, 'february': 2, 'fév': 2, 'février': 2,
+    'mar': 3, 'march': 3, 'mars': 3,
+    'apr': 4, 'april': 4, 'avr': 4, 'avril': 4,
+    'may': 5, 'mai': 5,
+    'jun': 6, 'june': 6, 'juin': 6,
+    'jul': 7, 'july': 7, 'juil': 7, 'juillet': 7,
+    'aug': 8, 'august': 8, 'aoû': 8, 'août': 8,
+    'sep': 9, 'sept': 9, 'september': 9, 'septembre': 9,
+    'oct': 10, 'october': 10, 'octobre': 10,
+    'nov': 11, 'november': 11, 'novembre': 11,
+    'dec': 12, 'december': 12, 'déc': 12, 'décembre': 12,
+}
+
 
 # ═══════════════════════════════════════════════════════════════
 # DATE EXTRACTION FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
 
-def is_weekly_summary(text: str) -> bool:
+def _build_automaton(keywords: dict):
+    """Build an Aho-Corasick automaton tagging every keyword with its group name"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for group, patterns in keywords.items():
+        for pattern in patterns:
+            automaton.add_word(pattern, group)
+    automaton.make_automaton()
+    return automaton
+
+
+_LOWER_AUTOMATON = _build_automaton(_LOWER_KEYWORDS)
+_RAW_AUTOMATON = _build_automaton(_RAW_KEYWORDS)
+
+
+def _keyword_groups(text: str, automaton, keywords: dict) -> set:
+    """Return the names of all keyword groups with at least one match in text"""
+    if automaton is not None:
+        return {group for _, group in automaton.iter(text)}
+    return {group for group, patterns in keywords.items() if any(p in text for p in patterns)}
+
+
+@dataclass(slots=True)
+class _Msg:
+    """Per-message values shared by all classifier helpers (computed once per message)"""
+    text: str
+    post_date: datetime
+    first_line: str
+    url_count: int
+    nlines: int
+    _lower: str = None
+    _lower_hits: set = None
+    _raw_hits: set = None
+    _range_match: object = _UNSET
+    _date_match: object = _UNSET
+
+    @classmethod
+    def from_text(cls, text: str, post_date) -> '_Msg':
+        return cls(
+            text=text,
+            post_date=post_date,
+            first_line=text.split('\n', 1)[0],
+            url_count=text.count("t.me/"),
+            nlines=text.count('\n') + 1,
+        )
+
+    @property
+    def lower(self) -> str:
+        """Lowercased text, only computed when a check actually needs it"""
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def lower_hits(self) -> set:
+        """Keyword groups ('weekly', 'today') found in the lowercased text"""
+        if self._lower_hits is None:
+            self._lower_hits = _keyword_groups(self.lower, _LOWER_AUTOMATON, _LOWER_KEYWORDS)
+        return self._lower_hits
+
+    @property
+    def raw_hits(self) -> set:
+        """Keyword groups ('script', 'emoji') found in the original text"""
+        if self._raw_hits is None:
+            self._raw_hits = _keyword_groups(self.text, _RAW_AUTOMATON, _RAW_KEYWORDS)
+        return self._raw_hits
+
+    @property
+    def range_match(self):
+        """Weekly '(DD MMM - DD MMM)' range match anywhere in the text, or None"""
+        if self._range_match is _UNSET:
+            self._range_match = _WEEKLY_RANGE_RE.search(self.text)
+        return self._range_match
+
+    @property
+    def date_match(self):
+        """'DD Month' date match in the first line, or None"""
+        if self._date_match is _UNSET:
+            self._date_match = _FIRSTLINE_DATE_RE.search(self.first_line)
+        return self._date_match
+
+
+def _fast_date(day_str: str, month_str: str, year: int) -> datetime:
+    """Build a date from day/month strings (raises ValueError for impossible days)"""
+    return datetime(year, _MONTHS[month_str.lower()], int(day_str))
+
+
+def is_weekly_summary(msg: _Msg) -> bool:
     """Check if message is a weekly summary"""
+    text = msg.text
     if "📅" in text:
-        weekly_patterns = [
-            "Here's what's going on",
-            "this week",
-            "Good evening",
-            "what's up this",
-            "weekend",
-            "Upcoming events"
-        ]
-        return any(pattern.lower() in text.lower() for pattern in weekly_patterns)
-
-    # Check for date range pattern even without emoji
-    if re.search(r'\(\d{1,2}\s+[A-Z]{3}\s*-\s*\d{1,2}\s+[A-Z]{3}\)', text):
-        return "•" in text  # Has bullet points
+        return 'weekly' in msg.lower_hits
+
+    # Check for date range pattern even without emoji (must have bullet points)
+    if "•" in text and msg.range_match:
+        return True
 
     return False
 
 
-def is_daily_summary(text: str, message_date) -> bool:
+def is_daily_summary(msg: _Msg) -> bool:
     """Check if message is a daily summary"""
-    # Count Telegram URLs
-    telegram_url_count = text.count("t.me/")
+    # Every daily summary links to at least one Telegram post
+    telegram_url_count = msg.url_count
+    if not telegram_url_count:
+        return False
 
     # Check message characteristics
-    is_short = len(text.split('\n')) <= 20
-    first_line = text.split('\n', 1)[0]
-    has_date_in_first_line = bool(re.search(r'(\d{1,2})\s*([A-Za-zÀ-ÿ]{3,})', first_line))
+    is_short = msg.nlines <= 20
 
     # Check for "today" references
-    daily_indicators = [
-        "today", "tonight", "this evening", "this afternoon",
-        "happening now", "later today", "daily", "today's"
-    ]
-    has_today_reference = any(indicator in text.lower() for indicator in daily_indicators)
-
-    # Check for script patterns
-    script_patterns = ["• **", "   Facebook", "   Tickets", "   Ticketswap", "★ <a href="]
-    has_script_pattern = any(pattern in text for pattern in script_patterns)
+    has_today_reference = 'today' in msg.lower_hits
 
-    # Check for daily emojis
-    daily_emojis = ["✨", "🔥", "🎉", "🎊", "💫", "⭐"]
-    has_daily_emoji = any(emoji in text for emoji in daily_emojis)
+    # Check for script patterns and daily emojis
+    raw_hits = msg.raw_hits
+    has_script_pattern = 'script' in raw_hits
+    has_daily_emoji = 'emoji' in raw_hits
 
     # Daily summary detection logic
-    if has_script_pattern and has_today_reference and telegram_url_count >= 1:
+    if has_script_pattern and has_today_reference:
         return True
-    elif has_daily_emoji and has_today_reference and telegram_url_count >= 1 and is_short:
-        return True
-    elif has_today_reference and telegram_url_count >= 1 and is_short and not has_date_in_first_line:
-        return True
-    elif telegram_url_count >= 2 and is_short and not has_date_in_first_line:
+    elif has_daily_emoji and has_today_reference and is_short:
         return True
+    elif not is_short or not (has_today_reference or telegram_url_count >= 2):
+        return False
 
-    return False
+    # Only run the first-line date regex when it can still change the outcome
+    return not msg.date_match
 
 
-def extract_weekly_summary_date(text: str, post_date) -> datetime:
+def extract_weekly_summary_date(msg: _Msg) -> datetime:
     """Extract end date from weekly summary"""
-    range_match = re.search(r'\((\d{1,2})\s+([A-Z]{3})\s*-\s*(\d{1,2})\s+([A-Z]{3})\)', text)
+    range_match = msg.range_match
     if not range_match:
         return None
 
-    try:
-        # Remove timezone info if present
-        if hasattr(post_date, 'tzinfo') and post_date.tzinfo:
-            post_date = post_date.replace(tzinfo=None)
+    start_day, start_month, end_day, end_month = range_match.group(
+        'start_day', 'start_month', 'end_day', 'end_month')
+    if start_month.lower() not in _MONTHS or end_month.lower() not in _MONTHS:
+        return None
 
-        # Parse end date
-        end_day = range_match.group(3)
-        end_month = range_match.group(4)
-        end_date = parse(f"{end_day} {end_month} {post_date.year}", dayfirst=True)
+    try:
+        post_date = msg.post_date
 
-        # Parse start date for validation
-        start_day = range_match.group(1)
-        start_month = range_match.group(2)
-        start_date = parse(f"{start_day} {start_month} {post_date.year}", dayfirst=True)
+        # Parse start date to pick the year of the range
+        year = post_date.year
+        start_date = _fast_date(start_day, start_month, year)
 
         # Check if dates are in the future relative to post
         days_diff = (start_date - post_date).days
         if days_diff < -7:  # More than a week in the past
-            start_date = start_date.replace(year=post_date.year + 1)
-            end_date = end_date.replace(year=post_date.year + 1)
+            year += 1
 
-        # Handle month transition
-        if end_date < start_date:
-            end_date = end_date.replace(year=start_date.year + 1)
+        # Parse end date, handling month transition (e.g. DEC - JAN)
+        end_month_num = _MONTHS[end_month.lower()]
+        end_day_num = int(end_day)
+        if (end_month_num, end_day_num) < (start_date.month, start_date.day):
+            year += 1
 
-        return end_date
-    except:
+        return datetime(year, end_month_num, end_day_num)
+    except ValueError:
         return None
 
 
-def extract_regular_event_date(text: str, post_date) -> datetime:
+def extract_regular_event_date(msg: _Msg) -> datetime:
     """Extract date from regular event post"""
-    first_line = text.split('\n', 1)[0]
-    match = re.search(r'(\d{1,2})\s*([A-Za-zÀ-ÿ]{3,})', first_line)
+    match = msg.date_match
 
     if not match:
         return None
 
+    day, month = match.group('day', 'month')
+    if month.lower() not in _MONTHS:
+        return None
+
     try:
-        # Remove timezone info if present
-        if hasattr(post_date, 'tzinfo') and post_date.tzinfo:
-            post_date = post_date.replace(tzinfo=None)
+        post_date = msg.post_date
 
-        day, month = match.groups()
-        event_date = parse(f"{day} {month} {post_date.year}", dayfirst=True)
+        month_num = _MONTHS[month.lower()]
+        day_num = int(day)
 
         # If event date is before post date, it's probably next year
-        if (event_date.month, event_date.day) < (post_date.month, post_date.day):
-            event_date = event_date.replace(year=post_date.year + 1)
+        year = post_date.year
+        if (month_num, day_num) < (post_date.month, post_date.day):
+            year += 1
 
-        return event_date
-    except:
+        return datetime(year, month_num, day_num)
+    except ValueError:
         return None
 
 
-def extract_event_date(text: str, post_date) -> datetime:
-    """Main function to extract event date based on message type"""
+def classify_message(text: str, post_date) -> tuple:
+    """
+    Classify a message in a single pass.
+
+    post_date must already be timezone-naive. Returns (kind, event_date, title)
+    where kind is 'weekly', 'daily' or 'regular'. event_date and title are None
+    when no date could be extracted.
+    """
+    msg = _Msg.from_text(text, post_date)
+
     # Check weekly summary first (highest priority)
-    if is_weekly_summary(text):
-        date = extract_weekly_summary_date(text, post_date)
-        if date:
-            return date
+    is_weekly = is_weekly_summary(msg)
+    event_date = extract_weekly_summary_date(msg) if is_weekly else None
+
+    # Fall back to daily summary, then regular event
+    is_daily = False
+    if not event_date:
+        is_daily = is_daily_summary(msg)
+        if is_daily:
+            # Use post date
+            event_date = post_date
+        else:
+            event_date = extract_regular_event_date(msg)
 
-    # Check daily summary
-    if is_daily_summary(text, post_date):
-        # Return post date without timezone
-        if hasattr(post_date, 'tzinfo') and post_date.tzinfo:
-            return post_date.replace(tzinfo=None)
-        return post_date
+    kind = 'weekly' if is_weekly else 'daily' if is_daily else 'regular'
+    if not event_date:
+        return kind, None, None
 
-    # Regular event
-    return extract_regular_event_date(text, post_date)
+    title = extract_event_title(msg, is_weekly, is_daily, event_date)
+    return kind, event_date, title
 
 
-def extract_event_title(text: str, is_weekly: bool, is_daily: bool, event_date, telegram_urls: int) -> str:
+def extract_event_title(msg: _Msg, is_weekly: bool, is_daily: bool, event_date) -> str:
     """Extract appropriate title based on message type"""
     if is_weekly:
-        range_match = re.search(r'\((\d{1,2}\s+[A-Z]{3}\s*-\s*\d{1,2}\s+[A-Z]{3})\)', text)
+        range_match = msg.range_match
         if range_match:
-            return f"📅 Weekly Summary: {range_match.group(1)}"
+            # Range text without the surrounding parentheses
+            return f"📅 Weekly Summary: {range_match.group(0)[1:-1]}"
         return "📅 Weekly Summary"
 
     elif is_daily:
+        telegram_urls = msg.url_count
         date_str = event_date.strftime('%d %b').upper() if event_date else "Unknown"
         event_word = "event" if telegram_urls == 1 else "events"
         return f"📆 Daily Summary: {date_str} ({telegram_urls} {event_word})"
 
     else:
         # Regular event title
-        first_line = text.split('\n', 1)[0].replace("*", "").strip()
+        first_line = msg.first_line.replace("*", "").strip()
         if '|' in first_line:
             _, title = [part.strip() for part in first_line.split('|', 1)]
             return title
@@ -324,12 +474,52 @@ def extract_event_title(text: str, is_weekly: bool, is_daily: bool, event_date,
 # MAIN SCANNING FUNCTION
 # ═══════════════════════════════════════════════════════════════
 
+def classify_batch(batch: list, channel_name: str, today_start: datetime) -> tuple:
+    """
+    Classify a batch of (message_id, text, post_date) tuples into event records.
+
+    Records are routed straight into past and future buckets and returned
+    column-wise (one list per field), so no combined table of every event is
+    ever built.
+    """
+    past_columns = {name: [] for name in EVENT_COLUMNS}
+    future_columns = {name: [] for name in EVENT_COLUMNS}
+
+    for message_id, text, post_date in batch:
+        # Determine message type, event date and title
+        kind, event_date, title = classify_message(text, post_date)
+
+        if not event_date:
+            continue
+
+        # Create event record
+        columns = past_columns if event_date < today_start else future_columns
+        columns['event_date'].append(event_date)
+        columns['title'].append(title)
+        columns['url'].append(f"https://t.me/{channel_name}/{message_id}")
+        columns['message_id'].append(message_id)
+        columns['is_weekly_summary'].append(kind == 'weekly')
+        columns['is_daily_summary'].append(kind == 'daily')
+
+    return past_columns, future_columns
+
+
+def build_events_frame(columns: dict, ascending: bool) -> pd.DataFrame:
+    """Build a display-ready DataFrame from column lists, sorted by event date"""
+    df = pd.DataFrame(columns)
+    df['event_date'] = pd.to_datetime(df['event_date']).dt.normalize()
+    df['is_weekly_summary'] = df['is_weekly_summary'].astype(bool)
+    df['is_daily_summary'] = df['is_daily_summary'].astype(bool)
+    df['is_summary'] = df['is_weekly_summary'] | df['is_daily_summary']
+    return df.sort_values(by='event_date', ascending=ascending)
+
+
 async def scan_and_clean_channel(channel_name: str, dry_run: bool = False, auto_confirm: bool = False):
     """Main function to scan channel and manage events"""
     await client.start()
 
-    events = []
     today = datetime.now()
+    today_start = datetime.combine(today.date(), datetime.min.time())
 
     print(f"\n📅 Current date: {today.strftime('%Y-%m-%d')} ({today.strftime('%A, %d %B %Y')})")
     print(f"📡 Scanning channel: {channel_name}")
@@ -338,62 +528,62 @@ async def scan_and_clean_channel(channel_name: str, dry_run: bool = False, auto_
     print("⏳ This may take a moment for channels with many messages...\n")
 
     message_count = 0
+    batch = []
+    tasks = []
 
-    # Scan all messages
+    # Scan all messages, classifying full batches in a worker thread while
+    # the next batch is still being downloaded
     async for message in client.iter_messages(channel_name):
         message_count += 1
         if message_count % 100 == 0:
             print(f"   Scanned {message_count} messages...")
 
-        if not message.text:
+        text = message.text
+        if not text:
             continue
 
-        # Determine message type
-        is_weekly = is_weekly_summary(message.text)
-        is_daily = is_daily_summary(message.text, message.date)
-        telegram_urls = message.text.count("t.me/")
+        # Skip texts that can't match any format: event dates and weekly ranges
+        # need a digit ("1JAN" at the very least), daily summaries need a t.me/ link
+        if len(text) < 4 or ("t.me/" not in text and not _DIGIT_RE.search(text)):
+            continue
 
-        # Extract event date
-        event_date = extract_event_date(message.text, message.date)
+        # Strip timezone once here so the extractors can use the date as-is
+        post_date = message.date.replace(tzinfo=None) if message.date.tzinfo else message.date
+        batch.append((message.id, text, post_date))
+        if len(batch) >= SCAN_BATCH_SIZE:
+            tasks.append(asyncio.create_task(asyncio.to_thread(classify_batch, batch, channel_name, today_start)))
+            batch = []
 
-        if not event_date:
-            continue
+    if batch:
+        tasks.append(asyncio.create_task(asyncio.to_thread(classify_batch, batch, channel_name, today_start)))
 
-        # Extract title
-        title = extract_event_title(message.text, is_weekly, is_daily, event_date, telegram_urls)
+    past_columns = {name: [] for name in EVENT_COLUMNS}
+    future_columns = {name: [] for name in EVENT_COLUMNS}
+    for batch_past, batch_future in await asyncio.gather(*tasks):
+        for name in EVENT_COLUMNS:
+            past_columns[name].extend(batch_past[name])
+            future_columns[name].extend(batch_future[name])
 
-        # Create event record
-        events.append({
-            'event_date': event_date.strftime('%Y-%m-%d'),
-            'title': title,
-            'url': f"https://t.me/{channel_name}/{message.id}",
-            'status': 'Past' if event_date.date() < today.date() else 'Future',
-            'message_id': message.id,
-            'is_weekly_summary': is_weekly,
-            'is_daily_summary': is_daily,
-            'is_summary': is_weekly or is_daily
-        })
-
-    if not events:
+    if not past_columns['message_id'] and not future_columns['message_id']:
         print("📭 No events found in this channel.")
         return
 
-    # Create DataFrame and sort
-    df = pd.DataFrame(events)
-    past_df = df[df['status'] == 'Past'].sort_values(by='event_date', ascending=False)
-    future_df = df[df['status'] == 'Future'].sort_values(by='event_date', ascending=True)
+    # Create DataFrames and sort
+    past_df = build_events_frame(past_columns, ascending=False)
+    future_df = build_events_frame(future_columns, ascending=True)
+    del past_columns, future_columns
 
     # Display summary
     print("=" * 70)
     print(f"📊 CHANNEL SUMMARY for @{channel_name}")
     print("=" * 70)
     print(f"Total messages scanned: {message_count}")
-    print(f"Events found: {len(df)}")
+    print(f"Events found: {len(past_df) + len(future_df)}")
 
     # Count by type
-    regular_count = len(df[~df['is_summary']])
-    weekly_count = len(df[df['is_weekly_summary']])
-    daily_count = len(df[df['is_daily_summary']])
+    regular_count = int((~past_df['is_summary']).sum() + (~future_df['is_summary']).sum())
+    weekly_count = int(past_df['is_weekly_summary'].sum() + future_df['is_weekly_summary'].sum())
+    daily_count = int(past_df['is_daily_summary'].sum() + future_df['is_daily_summary'].sum())
 
     print(f"  - Regular events: {regular_count}")
     print(f"  - Weekly summaries: {weekly_count}")
@@ -441,15 +631,23 @@ async def scan_and_clean_channel(channel_name: str, dry_run: bool = False, auto_
             if confirm in ['yes', 'y']:
                 print(f"\n🗑️ Deleting {len(past_df)} past events...")
                 deleted_count = 0
+                ids = past_df['message_id'].tolist()
 
-                for message_id in past_df['message_id']:
+                for start in range(0, len(ids), DELETE_BATCH_SIZE):
+                    chunk = ids[start:start + DELETE_BATCH_SIZE]
                     try:
-                        await client.delete_messages(channel_name, message_id)
-                        deleted_count += 1
-                        if deleted_count % 10 == 0:
-                            print(f"   Deleted {deleted_count}/{len(past_df)} messages...")
+                        await client.delete_messages(channel_name, chunk)
+                        deleted_count += len(chunk)
                     except Exception as e:
-                        print(f"   ⚠️ Could not delete message {message_id}: {e}")
+                        # Retry one by one so a single bad message doesn't block the rest
+                        print(f"   ⚠️ Batch delete failed ({e}), retrying individually...")
+                        for message_id in chunk:
+                            try:
+                                await client.delete_messages(channel_name, message_id)
+                                deleted_count += 1
+                            except Exception as e:
+                                print(f"   ⚠️ Could not delete message {message_id}: {e}")
+                    print(f"   Deleted {deleted_count}/{len(ids)} messages...")
 
                 print(f"\n✅ Successfully deleted {deleted_count} past events!")
             else:
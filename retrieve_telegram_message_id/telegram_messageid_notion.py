@@ -7,15 +7,33 @@ import asyncio
 import json
 import os
 import re
+import sys
 import argparse
+import functools
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 
+import httpx
 from telethon import TelegramClient
-from notion_client import Client
+from notion_client import AsyncClient
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: faster cache encode/decode
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick  # Optional: linear-time month token pre-scan
+except ImportError:
+    ahocorasick = None
+
+try:
+    import zstandard  # Optional: compressed cache file (LINK_CACHE_FILE ending in .zst)
+except ImportError:
+    zstandard = None
+
 # Load environment variables
 load_dotenv()
 
@@ -42,14 +60,72 @@ api_hash = TELEGRAM_API_HASH
 MASTER_DB_ID = os.getenv('NOTION_MASTER_DB_ID', '1f5b2c11515b801ebd95cd423b72eb55')
 LIVE_CHANNEL = os.getenv('TELEGRAM_LIVE_CHANNEL', 'raveinbelgium')
 TEST_CHANNEL = os.getenv('TELEGRAM_TEST_CHANNEL', 'testchannel1234123434')
-CACHE_FILE = '../event_link_cache.json'
+CACHE_FILE = os.getenv('LINK_CACHE_FILE', '../event_link_cache.jsonl')  # Append-only, one JSON record per line
+if CACHE_FILE.endswith('.zst') and zstandard is None:
+    raise ValueError("LINK_CACHE_FILE ends in .zst but the zstandard package is not installed")
+LEGACY_CACHE_FILE = '../event_link_cache.json'  # Single-document cache, migrated on first load
+CACHE_STAMP_FILE = CACHE_FILE + '.stamp'  # Holds only last_full_scan, see CacheManager.mark_full_scan
 CACHE_EXPIRY_DAYS = 30  # Keep cache for 30 days after event has passed
+_UNPARSED_LINK_MAX_AGE = timedelta(days=365)  # Links whose event date can't be parsed
+SCAN_QUEUE_SIZE = 256  # Telegram messages buffered ahead of event extraction
+QUICK_SCAN_LIMIT = 50  # Newest messages a quick scan reads at most
+NOTION_CONCURRENCY = 3  # Max in-flight Notion page updates (API allows ~3 req/s)
+
+_MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
+}
+_MONTH_ABBR = ('',) + tuple(_MONTHS)  # Month number -> 'JAN'..'DEC'
+_EMPTY: dict = {}  # Shared default for optional Notion properties (never mutated)
+
+# Precompiled patterns for event post detection (compiled once at import, shared by all matchers)
+_MONTH_ALT = '|'.join(_MONTHS)
+_DATE_RE = re.compile(rf'\d{{1,2}}\s+(?:{_MONTH_ALT})')
+_DATE_CAP_RE = re.compile(rf'(\d{{1,2}}\s+({_MONTH_ALT}))')
+
+# A public channel username, bare or as @name / t.me/name (numeric IDs and invite links don't match)
+_USERNAME_RE = re.compile(r'(?:@|(?:https?://)?t\.me/)?([A-Za-z][A-Za-z0-9_]{3,31})/?')
+
+
+def _build_token_automaton(summary_indicators) -> Optional["ahocorasick.Automaton"]:
+    """Aho-Corasick automaton tagging every token is_event_message looks at with its kind
+    (None when pyahocorasick is missing)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for token, kind in (('•', 'bullet'), ('Starts at', 'starts_at'), ('Lineup:', 'lineup'), ('★', 'star')):
+        automaton.add_word(token, kind)
+    for month in _MONTHS:
+        automaton.add_word(month, 'month')
+    for indicator in summary_indicators:
+        automaton.add_word(indicator, 'summary')
+    automaton.make_automaton()
+    return automaton
+
+
+def _make_notion_http_client() -> httpx.AsyncClient:
+    """Pooled HTTP client for Notion, multiplexed over HTTP/2 when the h2 package is installed"""
+    limits = httpx.Limits(max_keepalive_connections=10)
+    try:
+        return httpx.AsyncClient(http2=True, limits=limits)
+    except ImportError:
+        return httpx.AsyncClient(limits=limits)
+
 
 # Initialize clients
-notion = Client(auth=NOTION_TOKEN)
+notion = AsyncClient(auth=NOTION_TOKEN, client=_make_notion_http_client())
+
+
+@functools.lru_cache(maxsize=512)
+def _resolve_event_date(date_str: str, year: int) -> datetime:
+    """Parse a cached 'D MON' event date for the given year (memoized, many links share dates)"""
+    day, month = date_str.split()
+    return datetime(year, _MONTHS[month.upper()], int(day))
 
 
-@dataclass
+# slots keeps instances compact; not frozen because the live and test caches
+# share one CachedLink per Notion event and update it in place
+@dataclass(slots=True)
 class CachedLink:
     """Represents a cached link between Telegram and Notion"""
     telegram_id: int
@@ -59,167 +135,263 @@ class CachedLink:
     event_title: str
     linked_at: str
     last_verified: str
+    # Memoized is_expired result inputs, not part of the cache file
+    _expiry_day: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _expiry_date: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
 
-    def is_expired(self) -> bool:
+    def to_dict(self) -> dict:
+        """Flat dict for the cache file (cheaper than dataclasses.asdict's deep copy)"""
+        return {
+            'telegram_id': self.telegram_id,
+            'telegram_test_id': self.telegram_test_id,
+            'notion_id': self.notion_id,
+            'event_date': self.event_date,
+            'event_title': self.event_title,
+            'linked_at': self.linked_at,
+            'last_verified': self.last_verified
+        }
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
         """Check if this cache entry should be removed (30 days after event passed)"""
+        current_date = now or datetime.now()
+
+        # The expiry date only depends on the current day, so resolve it once per day
+        today = current_date.toordinal()
+        if self._expiry_day != today:
+            self._expiry_date = self._resolve_expiry(current_date)
+            self._expiry_day = today
+        return self._expiry_date is not None and current_date > self._expiry_date
+
+    def _resolve_expiry(self, current_date: datetime) -> Optional[datetime]:
+        """Expiry date of this entry, None if neither the event date nor linked_at parse"""
         try:
-            current_date = datetime.now()
             current_year = current_date.year
 
             # Parse the date with current year first
-            date_str = f"{self.event_date} {current_year}"
-            event_date = datetime.strptime(date_str, "%d %b %Y")
+            event_date = _resolve_event_date(self.event_date, current_year)
 
             # If the event date is more than 2 months in the past, it might be next year
             if event_date < current_date - timedelta(days=60):
-                date_str = f"{self.event_date} {current_year + 1}"
-                event_date = datetime.strptime(date_str, "%d %b %Y")
+                event_date = _resolve_event_date(self.event_date, current_year + 1)
 
             # Keep the cache entry until 30 days after the event
-            expiry_date = event_date + timedelta(days=CACHE_EXPIRY_DAYS)
-            return current_date > expiry_date
+            return event_date + timedelta(days=CACHE_EXPIRY_DAYS)
 
         except Exception:
-            # If we can't parse, check how old the link is
+            # If we can't parse, expire the link a year after it was made
             try:
-                linked_date = datetime.fromisoformat(self.linked_at)
-                return datetime.now() - linked_date > timedelta(days=365)
-            except:
-                return False
+                return datetime.fromisoformat(self.linked_at) + _UNPARSED_LINK_MAX_AGE
+            except (TypeError, ValueError):
+                return None
 
 
 class CacheManager:
     """Manages the cache of linked events"""
 
     def __init__(self):
+        # by_notion holds one CachedLink per Notion page and is what gets saved;
+        # cache and cache_test are lookup views onto the same objects
+        self.by_notion: Dict[str, CachedLink] = {}  # Keyed by Notion page ID
         self.cache: Dict[int, CachedLink] = {}  # Keyed by Telegram message ID
         self.cache_test: Dict[int, CachedLink] = {}  # Keyed by Test channel message ID
-        self.notion_to_telegram: Dict[str, int] = {}  # Reverse lookup
-        self.notion_to_test: Dict[str, int] = {}  # Reverse lookup for test channel
+        self.last_max_id: Dict[str, int] = {}  # Per channel, quick scans only read messages after this ID
         self.last_full_scan: Optional[str] = None
+        self._last_full_scan_dt: Optional[datetime] = None  # Parsed once, see needs_full_scan
+        self._pending: Dict[str, CachedLink] = {}  # Links changed since the last save, keyed by Notion ID
+        self._dirty = False  # Metadata (last_max_id) changed since the last save
+        self._lines_on_disk = 0  # Records in the cache file, superseded ones included
+        self._needs_compaction = False  # Next save rewrites the whole file
+        self._expired_cleaned = False  # clean_expired already ran this run
         self.load_cache()
 
+    @staticmethod
+    def _encode_record(record) -> bytes:
+        """One compact JSON line (orjson encodes CachedLink dataclasses natively)"""
+        if orjson:
+            return orjson.dumps(record) + b'\n'
+        return json.dumps(record, separators=(',', ':'), default=CachedLink.to_dict).encode('utf-8') + b'\n'
+
+    @staticmethod
+    def _pack(payload: bytes) -> bytes:
+        """Compress a batch of cache lines into its own zstd frame when the cache file is .zst"""
+        if CACHE_FILE.endswith('.zst'):
+            return zstandard.ZstdCompressor(level=3).compress(payload)
+        return payload
+
+    def _unpack_lines(self, f) -> List[bytes]:
+        """Lines of the cache file, decompressing all appended zstd frames for a .zst cache"""
+        if not CACHE_FILE.endswith('.zst'):
+            return f.readlines()
+
+        # Every save appended its own frame, decode them one by one so that a torn
+        # frame from an interrupted save only loses that save
+        data = f.read()
+        dctx = zstandard.ZstdDecompressor()
+        chunks = []
+        while data:
+            frame = dctx.decompressobj()
+            try:
+                chunks.append(frame.decompress(data))
+            except zstandard.ZstdError:
+                frame = None
+            if frame is None or not frame.eof:
+                self._needs_compaction = True
+                break
+            data = frame.unused_data
+        return b''.join(chunks).splitlines()
+
+    def _metadata_record(self) -> dict:
+        return {
+            'last_full_scan': self.last_full_scan,
+            'last_max_id': self.last_max_id,
+            'saved_at': datetime.now().isoformat()
+        }
+
     def load_cache(self):
-        """Load cache from file"""
-        if os.path.exists(CACHE_FILE):
+        """Load cache from file (or from the old single-document JSON cache on first run)"""
+        path = CACHE_FILE if os.path.exists(CACHE_FILE) else LEGACY_CACHE_FILE
+        if os.path.exists(path):
+            loads = orjson.loads if orjson else json.loads
             try:
-                with open(CACHE_FILE, 'r') as f:
-                    data = json.load(f)
-
-                    # Track unique notion IDs to avoid duplicates
-                    seen_notion_ids = set()
-
-                    # Load cached links
-                    for item in data.get('links', []):
-                        # Handle old cache format
-                        if 'telegram_test_id' not in item:
-                            item['telegram_test_id'] = None
-
-                        link = CachedLink(**item)
-                        if not link.is_expired():
-                            if link.telegram_id and link.telegram_id > 0:
-                                self.cache[link.telegram_id] = link
-                                self.notion_to_telegram[link.notion_id] = link.telegram_id
-                            if link.telegram_test_id and link.telegram_test_id > 0:
-                                self.cache_test[link.telegram_test_id] = link
-                                self.notion_to_test[link.notion_id] = link.telegram_test_id
-
-                            seen_notion_ids.add(link.notion_id)
-
-                    self.last_full_scan = data.get('last_full_scan')
-                    print(f"📦 Loaded cache: {len(self.cache)} live links, {len(self.cache_test)} test links")
-
-                    # Report expired entries
-                    original_count = len(data.get('links', []))
-                    if original_count > len(seen_notion_ids):
-                        print(f"   Expired {original_count - len(seen_notion_ids)} old entries")
+                with open(path, 'rb', buffering=65536) as f:
+                    if path == CACHE_FILE:
+                        records = []
+                        for line in self._unpack_lines(f):
+                            if not line.strip():
+                                continue
+                            try:
+                                records.append(loads(line))
+                            except ValueError:
+                                # Torn append from an interrupted save, rewrite the file next time
+                                self._needs_compaction = True
+                    else:
+                        # Old format: its links become records, the remaining keys are metadata
+                        data = loads(f.read())
+                        records = data.pop('links', []) + [data]
+                        self._needs_compaction = True
+                self._lines_on_disk = len(records)
+
+                # Records are appended over time, so later lines win
+                items = {}
+                for item in records:
+                    if 'notion_id' not in item:
+                        if 'last_max_id' in item:
+                            self.last_max_id = item['last_max_id'] or {}
+                        if item.get('last_full_scan'):
+                            self.last_full_scan = item['last_full_scan']
+                        continue
+
+                    # Handle old cache format
+                    if 'telegram_test_id' not in item:
+                        item['telegram_test_id'] = None
+                    items[item['notion_id']] = item
+
+                # Load cached links
+                now = datetime.now()
+                for item in items.values():
+                    link = CachedLink(**item)
+                    if not link.is_expired(now):
+                        if link.telegram_id and link.telegram_id > 0:
+                            self.cache[link.telegram_id] = link
+                        if link.telegram_test_id and link.telegram_test_id > 0:
+                            self.cache_test[link.telegram_test_id] = link
+                        self.by_notion[link.notion_id] = link
+
+                self._last_full_scan_dt = self._parse_timestamp(self.last_full_scan)
+                print(f"📦 Loaded cache: {len(self.cache)} live links, {len(self.cache_test)} test links")
+
+                # Report expired entries (they stay on disk until the next compaction)
+                if len(items) > len(self.by_notion):
+                    print(f"   Expired {len(items) - len(self.by_notion)} old entries")
             except Exception as e:
                 print(f"⚠️  Cache load error: {e}. Starting fresh.")
                 self.cache = {}
                 self.cache_test = {}
-                self.notion_to_telegram = {}
-                self.notion_to_test = {}
+                self.by_notion = {}
+                self.last_max_id = {}
+                self._needs_compaction = True
+
+        # The full scan stamp is written on its own and is always the most recent value
+        if os.path.exists(CACHE_STAMP_FILE):
+            try:
+                with open(CACHE_STAMP_FILE, 'r') as f:
+                    stamp = json.load(f).get('last_full_scan')
+                if stamp:
+                    self.last_full_scan = stamp
+                    self._last_full_scan_dt = self._parse_timestamp(stamp)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Cache stamp load error: {e}")
 
     def save_cache(self):
-        """Save cache to file"""
-        try:
+        """Append changed links to the cache file, rewriting it once superseded lines pile up"""
+        if not self._expired_cleaned:
             self.clean_expired()
+            self._expired_cleaned = True
 
-            # Combine all unique links by notion_id
-            all_links = {}
-
-            # Add live channel links
-            for telegram_id, link in self.cache.items():
-                if link.notion_id not in all_links:
-                    all_links[link.notion_id] = link
-                else:
-                    all_links[link.notion_id].telegram_id = link.telegram_id
-                    all_links[link.notion_id].last_verified = link.last_verified
+        if not (self._pending or self._dirty or self._needs_compaction):
+            return
 
-            # Add test channel links
-            for telegram_test_id, link in self.cache_test.items():
-                if link.notion_id in all_links:
-                    all_links[link.notion_id].telegram_test_id = telegram_test_id
-                else:
-                    all_links[link.notion_id] = link
-
-            data = {
-                'links': [asdict(link) for link in all_links.values()],
-                'last_full_scan': self.last_full_scan,
-                'saved_at': datetime.now().isoformat()
-            }
-
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
-
-            print(f"💾 Saved {len(all_links)} links to cache")
+        try:
+            if self._needs_compaction or self._lines_on_disk > 2 * len(self.by_notion):
+                # Compact: one line per live link, written to a temp file and swapped in
+                # so a crash never leaves a torn cache
+                records = [*self.by_notion.values(), self._metadata_record()]
+                tmp_path = CACHE_FILE + '.tmp'
+                with open(tmp_path, 'wb', buffering=65536) as f:
+                    f.write(self._pack(b''.join(map(self._encode_record, records))))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, CACHE_FILE)
+                self._lines_on_disk = len(records)
+                self._needs_compaction = False
+                print(f"💾 Saved {len(self.by_notion)} links to cache")
+            else:
+                # Only the delta is written (a torn last line is skipped on load)
+                records = [link for nid, link in self._pending.items() if nid in self.by_notion]
+                link_count = len(records)
+                if self._dirty:
+                    records.append(self._metadata_record())
+                with open(CACHE_FILE, 'ab', buffering=65536) as f:
+                    f.write(self._pack(b''.join(map(self._encode_record, records))))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._lines_on_disk += len(records)
+                print(f"💾 Saved {link_count} changed links to cache")
+
+            self._pending.clear()
+            self._dirty = False
         except Exception as e:
             print(f"❌ Cache save error: {e}")
 
     def clean_expired(self):
         """Remove expired entries"""
-        expired_live = [tid for tid, link in self.cache.items() if link.is_expired()]
-        for tid in expired_live:
-            link = self.cache[tid]
-            del self.cache[tid]
-            if link.notion_id in self.notion_to_telegram:
-                del self.notion_to_telegram[link.notion_id]
-
-        expired_test = [tid for tid, link in self.cache_test.items() if link.is_expired()]
-        for tid in expired_test:
-            link = self.cache_test[tid]
-            del self.cache_test[tid]
-            if link.notion_id in self.notion_to_test:
-                del self.notion_to_test[link.notion_id]
+        now = datetime.now()
+
+        # Expiry is decided once per link on the canonical map, the views just follow it
+        # (expired lines stay in the file until save_cache compacts it)
+        self.by_notion = {nid: link for nid, link in self.by_notion.items() if not link.is_expired(now)}
+        live = self.by_notion
+        self.cache = {tid: link for tid, link in self.cache.items() if link.notion_id in live}
+        self.cache_test = {tid: link for tid, link in self.cache_test.items() if link.notion_id in live}
 
     def add_link(self, telegram_id: int, notion_id: str, event_date: str, event_title: str,
-                 is_test: bool = False):
-        """Add a new link to cache"""
-        now = datetime.now().isoformat()
-
-        # Look for existing link
-        existing_link = None
-        for link in self.cache.values():
-            if link.notion_id == notion_id:
-                existing_link = link
-                break
+                 is_test: bool = False, now: Optional[str] = None):
+        """Add a new link to cache (pass now to stamp a whole batch with one timestamp)"""
+        now = now or datetime.now().isoformat()
 
-        if not existing_link:
-            for link in self.cache_test.values():
-                if link.notion_id == notion_id:
-                    existing_link = link
-                    break
+        # Look for existing link (one object per Notion event, shared by both channel caches)
+        existing_link = self.by_notion.get(notion_id)
 
         if existing_link:
             # Update existing link
             if is_test:
                 existing_link.telegram_test_id = telegram_id
                 self.cache_test[telegram_id] = existing_link
-                self.notion_to_test[notion_id] = telegram_id
             else:
                 existing_link.telegram_id = telegram_id
                 self.cache[telegram_id] = existing_link
-                self.notion_to_telegram[notion_id] = telegram_id
+            self.by_notion[notion_id] = existing_link
+            self._pending[notion_id] = existing_link
             existing_link.last_verified = now
         else:
             # Create new link
@@ -234,7 +406,6 @@ class CacheManager:
                     last_verified=now
                 )
                 self.cache_test[telegram_id] = new_link
-                self.notion_to_test[notion_id] = telegram_id
             else:
                 new_link = CachedLink(
                     telegram_id=telegram_id,
@@ -246,48 +417,67 @@ class CacheManager:
                     last_verified=now
                 )
                 self.cache[telegram_id] = new_link
-                self.notion_to_telegram[notion_id] = telegram_id
+            self.by_notion[notion_id] = new_link
+            self._pending[notion_id] = new_link
+
+    def note_max_id(self, channel: str, message_id: int):
+        """Move a channel's quick scan start forward to message_id (it never moves back)"""
+        if message_id > self.last_max_id.get(channel, 0):
+            self.last_max_id[channel] = message_id
+            self._dirty = True
 
     def is_linked(self, telegram_id: int = None, notion_id: str = None, is_test: bool = False) -> bool:
         """Check if an event is already linked"""
-        if is_test:
-            if telegram_id:
-                return telegram_id in self.cache_test
-            if notion_id:
-                return notion_id in self.notion_to_test
-        else:
-            if telegram_id:
-                return telegram_id in self.cache
-            if notion_id:
-                return notion_id in self.notion_to_telegram
+        if telegram_id:
+            return telegram_id in (self.cache_test if is_test else self.cache)
+        if notion_id:
+            link = self.by_notion.get(notion_id)
+            return bool(link and (link.telegram_test_id if is_test else link.telegram_id))
         return False
 
     def needs_full_scan(self) -> bool:
         """Check if we need a full scan (once per day)"""
-        if not self.last_full_scan:
+        if self._last_full_scan_dt is None:
             return True
+        return datetime.now() - self._last_full_scan_dt >= timedelta(hours=24)
 
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        """Parse an ISO timestamp from the cache file, None if missing or invalid"""
+        if not value:
+            return None
         try:
-            last_scan = datetime.fromisoformat(self.last_full_scan)
-            hours_since = (datetime.now() - last_scan).total_seconds() / 3600
-            return hours_since >= 24
-        except:
-            return True
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
 
     def mark_full_scan(self):
-        """Mark that a full scan was completed"""
-        self.last_full_scan = datetime.now().isoformat()
-        self.save_cache()
+        """Mark that a full scan was completed (only the small stamp file is rewritten)"""
+        self._last_full_scan_dt = datetime.now()
+        self.last_full_scan = self._last_full_scan_dt.isoformat()
+
+        try:
+            # Write to a temp file and swap it in so a crash never leaves a torn stamp
+            tmp_path = CACHE_STAMP_FILE + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'last_full_scan': self.last_full_scan}, f)
+            os.replace(tmp_path, CACHE_STAMP_FILE)
+        except OSError as e:
+            print(f"❌ Cache stamp save error: {e}")
 
 
 class EventMatcher:
     """Handles matching between Telegram posts and Notion events"""
 
-    SUMMARY_INDICATORS = [
+    # Matched case-sensitively on purpose: the summary posts use these exact headings, while
+    # event descriptions may well say "festivals" or "techno clubs" in running text
+    SUMMARY_INDICATORS = (
         "📅 Good evening", "FESTIVALS", "TECHNO CLUBS",
         "LOCAL FAVORITES", "Weekly summary", "Daily summary",
         "<!-- WEEKLY_SUMMARY -->", "<!-- DAILY_SUMMARY -->"
-    ]
+    )
+    SUMMARY_RE = re.compile('|'.join(map(re.escape, SUMMARY_INDICATORS)))
+    TOKEN_AUTOMATON = _build_token_automaton(SUMMARY_INDICATORS)
 
     def __init__(self, cache: CacheManager, test_mode: bool = False):
         self.cache = cache
@@ -299,20 +489,50 @@ class EventMatcher:
         if not text or len(text) < 50:
             return False
 
-        if any(indicator in text for indicator in self.SUMMARY_INDICATORS):
+        # Every event post has a bullet or a lineup, so plain substring scans reject most
+        # other messages before any automaton or regex work
+        has_lineup = "Lineup:" in text
+        if not has_lineup and "•" not in text:
+            return False
+
+        if self.TOKEN_AUTOMATON is not None:
+            return self._is_event_message_single_pass(text)
+
+        # Cheap substring checks first, the month regex only runs on survivors
+        has_starts_at = "Starts at" in text
+        if not (has_starts_at or has_lineup):
+            return False
+
+        if self.SUMMARY_RE.search(text):
             return False
 
-        if text.count('★') > 3 or text.count('Starts at') > 1 or text.count('Lineup:') > 1:
+        if (text.count('★') > 3
+                or (has_starts_at and text.count('Starts at') > 1)
+                or (has_lineup and text.count('Lineup:') > 1)):
+            return False
+
+        return bool(_DATE_RE.search(text))
+
+    def _is_event_message_single_pass(self, text: str) -> bool:
+        """is_event_message counting every token in one automaton pass instead of repeated scans"""
+        counts = {'bullet': 0, 'starts_at': 0, 'lineup': 0, 'star': 0, 'month': 0}
+        for _, kind in self.TOKEN_AUTOMATON.iter(text):
+            if kind == 'summary':
+                return False
+            counts[kind] += 1
+
+        if not ((counts['bullet'] and counts['starts_at']) or counts['lineup']):
             return False
 
-        has_date = bool(re.search(r'\d{1,2}\s+(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)', text))
-        has_event_format = ("•" in text and "Starts at" in text) or "Lineup:" in text
+        if counts['star'] > 3 or counts['starts_at'] > 1 or counts['lineup'] > 1:
+            return False
 
-        return has_date and has_event_format
+        # The full date regex only runs when a month token was seen
+        return bool(counts['month']) and bool(_DATE_RE.search(text))
 
     def extract_event_data(self, text: str) -> Optional[Tuple[str, str, str]]:
         """Extract date, location, and title from Telegram message"""
-        date_match = re.search(r'(\d{1,2}\s+(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC))', text)
+        date_match = _DATE_CAP_RE.search(text)
         if not date_match:
             return None
 
@@ -357,60 +577,105 @@ class EventMatcher:
             "cache_hits": 0
         }
 
-        channel_entity = await client.get_entity(channel)
+        # The session file already stores the peer for a resolved username, so this is served
+        # from it after the first run (get_entity would fetch the full channel every time)
+        channel_entity = await client.get_input_entity(channel)
+        # Public posts are linked by username; channels configured any other way get the
+        # t.me/c/ link, which takes the bare channel ID of the resolved peer
+        username_match = _USERNAME_RE.fullmatch(channel)
+        if username_match:
+            post_link_base = f"https://t.me/{username_match.group(1)}"
+        else:
+            post_link_base = f"https://t.me/c/{getattr(channel_entity, 'channel_id', channel)}"
 
-        # Determine scan depth - full scan applies to BOTH channels
-        if force_full_scan or self.cache.needs_full_scan():
+        # Determine scan depth once - full scan applies to BOTH channels
+        full_scan = force_full_scan or self.cache.needs_full_scan()
+        if full_scan:
             print("🔄 Performing full scan (all messages)...")
             limit = None  # Scan all messages
         else:
-            print("⚡ Quick scan (last 50 messages)...")
-            limit = 50
+            print(f"⚡ Quick scan (new messages, at most {QUICK_SCAN_LIMIT})...")
+            limit = QUICK_SCAN_LIMIT
+
+        # Notion is queried on full scans or once an unlinked post turns up, so start
+        # fetching as soon as either is known and let it run while Telegram is scanned
+        notion_prefetch = None
+        if full_scan:
+            notion_prefetch = asyncio.create_task(self._fetch_upcoming_notion_events())
 
         telegram_events = []  # Collect unlinked events
-        existing_message_ids = set()  # Track which message IDs exist
-
-        async for message in client.iter_messages(channel_entity, limit=limit):
-            stats["messages_scanned"] += 1
-            existing_message_ids.add(message.id)
-
-            if not message.text or not self.is_event_message(message.text):
-                continue
-
-            # Check cache first
-            if self.cache.is_linked(telegram_id=message.id, is_test=is_test):
-                stats["cache_hits"] += 1
-                continue
-
-            # Extract event data
-            event_data = self.extract_event_data(message.text)
-            if event_data:
-                date, location, title = event_data
-                telegram_events.append({
-                    'id': message.id,
-                    'date': date,
-                    'location': location,
-                    'title': title,
-                    'key': f"{date}|{location}".lower()
-                })
+        message_ids = []  # Track which message IDs exist (turned into a set after the scan)
+
+        # Quick scans let Telegram skip everything up to the last scan's watermark
+        min_id = 0 if limit is None else self.cache.last_max_id.get(channel, 0)
+
+        # Telegram pages are fetched by a producer task, so the next page is already in flight
+        # while the current one is classified here
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SCAN_QUEUE_SIZE)
+        producer = asyncio.create_task(
+            self._produce_messages(queue, client.iter_messages(channel_entity, limit=limit, min_id=min_id))
+        )
+
+        try:
+            while (message := await queue.get()) is not None:
+                stats["messages_scanned"] += 1
+                message_ids.append(message.id)
+
+                if not message.text or not self.is_event_message(message.text):
+                    continue
+
+                # Check cache first
+                if self.cache.is_linked(telegram_id=message.id, is_test=is_test):
+                    stats["cache_hits"] += 1
+                    continue
+
+                # Extract event data
+                event_data = self.extract_event_data(message.text)
+                if event_data:
+                    date, location, title = event_data
+                    telegram_events.append({
+                        'id': message.id,
+                        'date': date,
+                        'location': location,
+                        'title': title,
+                        'key': self._match_key(date, location)
+                    })
+                    if notion_prefetch is None:
+                        notion_prefetch = asyncio.create_task(self._fetch_upcoming_notion_events())
+
+            await producer  # Re-raises a Telegram error that ended the scan early
+        except BaseException:
+            # Don't leave the reader blocked on a full queue or the Notion prefetch unawaited
+            pending = [task for task in (producer, notion_prefetch) if task is not None]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise
+
+        # Built in one go so the set is sized once instead of rehashing as it grows
+        existing_message_ids = set(message_ids)
+        max_seen_id = max(message_ids, default=0)
+        unresolved_ids = {event['id'] for event in telegram_events}  # Posts not linked by the end of this scan
 
         # Only query Notion if we found unlinked Telegram events OR doing full scan
-        if telegram_events or (force_full_scan or self.cache.needs_full_scan()):
+        if telegram_events or full_scan:
             print(f"🔍 Found {len(telegram_events)} unlinked posts. Checking Notion...")
             stats["notion_queries"] = 1
 
-            # Load Notion events
-            await self._load_notion_events_for_dates(
-                {event['date'] for event in telegram_events} if telegram_events else set()
-            )
-
-            # Check for orphaned Notion entries (old message IDs that no longer exist)
-            if force_full_scan or self.cache.needs_full_scan():
-                await self._check_and_update_orphaned_links(
+            # Load Notion events, and on full scans check for orphaned Notion entries
+            # (old message IDs that no longer exist) over the same connection pool
+            notion_reads = [self._load_notion_events_for_dates(
+                {event['date'] for event in telegram_events} if telegram_events else set(),
+                prefetch=notion_prefetch
+            )]
+            if full_scan:
+                notion_reads.append(self._check_and_update_orphaned_links(
                     client, channel_entity, existing_message_ids, is_test, stats
-                )
+                ))
+            await asyncio.gather(*notion_reads)
 
-            # Match and link new events
+            # Match and link new events (Notion writes are collected and sent concurrently)
+            pending_updates = []
             for tg_event in telegram_events:
                 if tg_event['key'] in self.notion_events:
                     notion_event = self.notion_events[tg_event['key']]
@@ -420,6 +685,7 @@ class EventMatcher:
                         existing_id = notion_event.get('telegram_test_channel_id')
                         if existing_id == tg_event['id']:
                             stats["already_linked"] += 1
+                            unresolved_ids.discard(tg_event['id'])
                             self.cache.add_link(
                                 tg_event['id'],
                                 notion_event['id'],
@@ -436,6 +702,7 @@ class EventMatcher:
                         existing_id = notion_event.get('telegram_message_id')
                         if existing_id == tg_event['id']:
                             stats["already_linked"] += 1
+                            unresolved_ids.discard(tg_event['id'])
                             self.cache.add_link(
                                 tg_event['id'],
                                 notion_event['id'],
@@ -451,52 +718,82 @@ class EventMatcher:
 
                     # Link the event (new or replacing orphaned)
                     if not self.test_mode:
-                        is_update = bool(existing_id)
-                        success = await self._update_notion_event(
-                            notion_event['id'],
-                            tg_event['id'],
-                            channel_entity.username,
-                            is_test=is_test,
-                            is_update=is_update
-                        )
-                        if success:
-                            if is_update:
-                                stats["updated_links"] += 1
-                            else:
-                                stats["newly_linked"] += 1
-                            self.cache.add_link(
-                                tg_event['id'],
-                                notion_event['id'],
-                                tg_event['date'],
-                                tg_event['title'],
-                                is_test=is_test
-                            )
+                        pending_updates.append((tg_event, notion_event, bool(existing_id)))
                     else:
                         print(f"   [TEST MODE] Would link: {tg_event['title']} → Message {tg_event['id']}")
                         stats["newly_linked"] += 1
+
+            if pending_updates:
+                semaphore = asyncio.Semaphore(NOTION_CONCURRENCY)
+                results = await asyncio.gather(*(
+                    self._update_notion_event_limited(
+                        semaphore,
+                        notion_event['id'],
+                        tg_event['id'],
+                        post_link_base,
+                        is_test=is_test,
+                        is_update=is_update
+                    )
+                    for tg_event, notion_event, is_update in pending_updates
+                ))
+
+                linked_at = datetime.now().isoformat()
+                for (tg_event, notion_event, is_update), success in zip(pending_updates, results):
+                    if success:
+                        unresolved_ids.discard(tg_event['id'])
+                        if is_update:
+                            stats["updated_links"] += 1
+                        else:
+                            stats["newly_linked"] += 1
+                        self.cache.add_link(
+                            tg_event['id'],
+                            notion_event['id'],
+                            tg_event['date'],
+                            tg_event['title'],
+                            is_test=is_test,
+                            now=linked_at
+                        )
         else:
             print("✅ All events already linked (from cache)")
 
-        # Save cache after each channel
+        # Posts still waiting for their Notion row, or whose link failed, must be read again by the
+        # next quick scan, so the watermark stops just below the oldest of them (but never holds back
+        # more than the QUICK_SCAN_LIMIT messages a quick scan would read anyway)
+        watermark = max_seen_id
+        if unresolved_ids:
+            watermark = max(min(unresolved_ids) - 1, max_seen_id - QUICK_SCAN_LIMIT)
+        self.cache.note_max_id(channel, watermark)
+
+        # Save cache after each channel (the fsync runs in a worker thread, off the event loop)
         if not self.test_mode:
-            self.cache.save_cache()
+            await asyncio.to_thread(self.cache.save_cache)
 
         return stats
 
+    @staticmethod
+    async def _produce_messages(queue: asyncio.Queue, messages):
+        """Feed messages from a Telegram iterator into the scan queue, ending with a None sentinel"""
+        try:
+            async for message in messages:
+                await queue.put(message)
+        except asyncio.CancelledError:
+            raise  # Cancelled by the scan loop, which no longer reads the queue
+        except BaseException:
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
     async def _check_and_update_orphaned_links(self, client, channel_entity, existing_message_ids, is_test, stats):
         """Check for Notion entries with orphaned message IDs and clear them"""
         print("🔍 Checking for orphaned message IDs...")
 
-        # Load ALL Notion events with IDs
-        all_events_response = notion.databases.query(
-            database_id=MASTER_DB_ID,
-            filter={
-                "property": "telegram_message_id" if not is_test else "telegram_test_channel_id",
-                "number": {"is_not_empty": True}
-            }
-        )
+        # Load ALL Notion events with IDs (every page, not just the first 100)
+        all_events = await self._query_database({
+            "property": "telegram_message_id" if not is_test else "telegram_test_channel_id",
+            "number": {"is_not_empty": True}
+        })
 
-        for item in all_events_response["results"]:
+        for item in all_events:
             p = item["properties"]
 
             if is_test:
@@ -514,64 +811,95 @@ class EventMatcher:
                 # We don't clear it here, but mark it for potential replacement
                 # The new message with same event will update it
 
-    async def _load_notion_events_for_dates(self, dates: Set[str]):
-        """Load Notion events with ALL their IDs"""
-        self.notion_events.clear()
+    async def _query_database(self, filter: dict) -> List[dict]:
+        """Query the master database, following pagination cursors until all results are loaded"""
+        results = []
+        query = {"database_id": MASTER_DB_ID, "filter": filter, "page_size": 100}
+
+        while True:
+            response = await notion.databases.query(**query)
+            results.extend(response["results"])
+            if not response.get("has_more"):
+                return results
+            query["start_cursor"] = response["next_cursor"]
 
+    async def _fetch_upcoming_notion_events(self) -> List[dict]:
+        """Fetch and parse all non-skipped Notion events in the next year"""
         # Date range for filtering
         min_date = datetime.now().date()
-        max_date = datetime.now().date() + timedelta(days=365)
-
-        response = notion.databases.query(
-            database_id=MASTER_DB_ID,
-            filter={
-                "and": [
-                    {"property": "event_date", "date": {
-                        "on_or_after": min_date.isoformat(),
-                        "on_or_before": max_date.isoformat()
-                    }},
-                    {"or": [
-                        {"property": "data_status", "multi_select": {"does_not_contain": "skipped"}},
-                        {"property": "data_status", "multi_select": {"is_empty": True}}
-                    ]}
-                ]
-            }
-        )
+        max_date = min_date + timedelta(days=365)
+
+        items = await self._query_database({
+            "and": [
+                {"property": "event_date", "date": {
+                    "on_or_after": min_date.isoformat(),
+                    "on_or_before": max_date.isoformat()
+                }},
+                {"or": [
+                    {"property": "data_status", "multi_select": {"does_not_contain": "skipped"}},
+                    {"property": "data_status", "multi_select": {"is_empty": True}}
+                ]}
+            ]
+        })
+
+        return [event for event in map(self._parse_notion_event, items) if event]
+
+    async def _load_notion_events_for_dates(self, dates: Set[str], prefetch: Optional[asyncio.Task] = None):
+        """Load Notion events with ALL their IDs (reusing a prefetch task if one was started)"""
+        self.notion_events.clear()
+
+        events = await prefetch if prefetch else await self._fetch_upcoming_notion_events()
+
+        # Notion dates are formatted as unpadded 'D MON', so normalize Telegram dates the same way
+        wanted_dates = {date.upper().lstrip('0') for date in dates}
 
-        for item in response["results"]:
-            event = self._parse_notion_event(item)
-            if event:
-                # Match dates
-                for date in dates:
-                    if date.upper() in event['date'].upper() or event['date'].upper() in date.upper():
-                        # Generate keys for matching
-                        for key in self._generate_keys(event['date'], event['location']):
-                            self.notion_events[key] = event
+        for event in events:
+            # Match dates
+            if event['date'] in wanted_dates:
+                self.notion_events[self._match_key(event['date'], event['location'])] = event
 
     def _parse_notion_event(self, item: dict) -> Optional[dict]:
         """Parse a Notion database item with ALL ID fields"""
         p = item["properties"]
 
-        status_items = p.get("data_status", {}).get("multi_select", [])
-        if any(s.get("name", "").lower() == "skipped" for s in status_items):
+        # Direct indexing on the hot path, missing or null properties land in the except branches
+        try:
+            event_date = p["event_date"]["date"]["start"]
+        except (KeyError, TypeError):
             return None
-
-        event_date = p.get("event_date", {}).get("date", {}).get("start", "")
         if not event_date:
             return None
 
         try:
-            date_obj = datetime.strptime(event_date, "%Y-%m-%d")
-            formatted_date = f"{date_obj.day} {date_obj.strftime('%b').upper()}"
-        except:
+            status_items = p["data_status"]["multi_select"]
+        except (KeyError, TypeError):
+            status_items = ()
+        if any(s["name"].lower() == "skipped" for s in status_items):
+            return None
+
+        # Fixed YYYY-MM-DD format, split by hand instead of strptime
+        try:
+            _, month, day = event_date.split('-')
+            month, day = int(month), int(day)
+        except ValueError:
+            return None
+        if not 1 <= month <= 12:
             return None
+        # Dates and venues repeat across events, so intern them to share one copy
+        formatted_date = sys.intern(f"{day} {_MONTH_ABBR[month]}")
 
-        title = p["title"]["title"][0]["plain_text"] if p.get("title", {}).get("title") else ""
-        location = self._safe_get_text(p.get("event_location", {}).get("rich_text", []))
+        try:
+            title = p["title"]["title"][0]["plain_text"]
+        except (KeyError, IndexError, TypeError):
+            title = ""
+        try:
+            location = sys.intern(self._safe_get_text(p["event_location"]["rich_text"]))
+        except (KeyError, TypeError):
+            location = ""
 
         # Get both IDs
-        live_id = p.get("telegram_message_id", {}).get("number")
-        test_id = p.get("telegram_test_channel_id", {}).get("number")
+        live_id = (p.get("telegram_message_id") or _EMPTY).get("number")
+        test_id = (p.get("telegram_test_channel_id") or _EMPTY).get("number")
 
         return {
             'id': item["id"],
@@ -588,26 +916,23 @@ class EventMatcher:
             return rich_text_list[0].get("plain_text", "")
         return ""
 
-    def _generate_keys(self, date: str, location: str) -> List[str]:
-        """Generate multiple matching keys"""
-        keys = []
-        base_key = f"{date}|{location}".lower()
-        keys.append(base_key)
-
-        # Add padded version for single digit dates
-        if len(date.split()[0]) == 1:
-            padded = f"0{date}|{location}".lower()
-            keys.append(padded)
+    @staticmethod
+    def _match_key(date: str, location: str) -> str:
+        """Canonical 'd mon|location' key shared by Telegram and Notion events (day unpadded)"""
+        return sys.intern(f"{date.lstrip('0')}|{location}".lower())
 
-        return keys
+    async def _update_notion_event_limited(self, semaphore: asyncio.Semaphore, *args, **kwargs) -> bool:
+        """Run _update_notion_event while holding a slot of the given semaphore"""
+        async with semaphore:
+            return await self._update_notion_event(*args, **kwargs)
 
-    async def _update_notion_event(self, notion_id: str, message_id: int, username: str, is_test: bool = False, is_update: bool = False) -> bool:
-        """Update Notion event with Telegram link"""
+    async def _update_notion_event(self, notion_id: str, message_id: int, post_link_base: str, is_test: bool = False, is_update: bool = False) -> bool:
+        """Update Notion event with Telegram link (post_link_base is the channel's t.me prefix)"""
         try:
             if is_test:
                 # Update test channel ID only
                 action = "Updating" if is_update else "Linking"
-                notion.pages.update(
+                await notion.pages.update(
                     page_id=notion_id,
                     properties={
                         "telegram_test_channel_id": {"number": message_id}
@@ -617,9 +942,9 @@ class EventMatcher:
             else:
                 # Update live channel fields
                 action = "Updating" if is_update else "Linking"
-                post_url = f"https://t.me/{username}/{message_id}" if username else f"https://t.me/c/{LIVE_CHANNEL}/{message_id}"
+                post_url = f"{post_link_base}/{message_id}"
 
-                notion.pages.update(
+                await notion.pages.update(
                     page_id=notion_id,
                     properties={
                         "telegram_url": {"url": post_url},
@@ -648,42 +973,46 @@ async def run_cached_linker(test_mode: bool = False):
     # Check if we need a full scan
     do_full_scan = cache.needs_full_scan()
 
-    async with TelegramClient('cached_linker_session', api_id, api_hash) as client:
-        print("\n📱 SCANNING LIVE CHANNEL")
-        print("-" * 30)
-        stats_live = await matcher.smart_link_events(client, 'live', force_full_scan=do_full_scan)
-
-        print("\n📱 SCANNING TEST CHANNEL")
-        print("-" * 30)
-        stats_test = await matcher.smart_link_events(client, 'test', force_full_scan=do_full_scan)
-
-        # Mark full scan as completed after both channels
-        if do_full_scan and not test_mode:
-            cache.mark_full_scan()
-
-        # Summary
-        print("\n📊 SUMMARY")
-        print("=" * 50)
-        print(f"LIVE Channel (@{LIVE_CHANNEL}):")
-        print(f"  ✅ Newly linked: {stats_live['newly_linked']}")
-        print(f"  🔄 Updated (reposted): {stats_live.get('updated_links', 0)}")
-        print(f"  💾 Cached links: {stats_live['cached_links']}")
-        print(f"  📱 Messages scanned: {stats_live['messages_scanned']}")
-        print(f"\nTEST Channel (@{TEST_CHANNEL}):")
-        print(f"  ✅ Newly linked: {stats_test['newly_linked']}")
-        print(f"  🔄 Updated (reposted): {stats_test.get('updated_links', 0)}")
-        print(f"  💾 Cached links: {stats_test['cached_links']}")
-        print(f"  📱 Messages scanned: {stats_test['messages_scanned']}")
-
-        total_linked = stats_live['newly_linked'] + stats_test['newly_linked']
-        total_updated = stats_live.get('updated_links', 0) + stats_test.get('updated_links', 0)
-
-        if total_linked > 0 or total_updated > 0:
-            print(f"\n✨ Total changes:")
-            if total_linked > 0:
-                print(f"   Newly linked: {total_linked}")
-            if total_updated > 0:
-                print(f"   Updated (reposted): {total_updated}")
+    try:
+        async with TelegramClient('cached_linker_session', api_id, api_hash) as client:
+            print("\n📱 SCANNING LIVE CHANNEL")
+            print("-" * 30)
+            stats_live = await matcher.smart_link_events(client, 'live', force_full_scan=do_full_scan)
+
+            print("\n📱 SCANNING TEST CHANNEL")
+            print("-" * 30)
+            stats_test = await matcher.smart_link_events(client, 'test', force_full_scan=do_full_scan)
+
+            # Mark full scan as completed after both channels
+            if do_full_scan and not test_mode:
+                cache.mark_full_scan()
+
+            # Summary
+            print("\n📊 SUMMARY")
+            print("=" * 50)
+            print(f"LIVE Channel (@{LIVE_CHANNEL}):")
+            print(f"  ✅ Newly linked: {stats_live['newly_linked']}")
+            print(f"  🔄 Updated (reposted): {stats_live.get('updated_links', 0)}")
+            print(f"  💾 Cached links: {stats_live['cached_links']}")
+            print(f"  📱 Messages scanned: {stats_live['messages_scanned']}")
+            print(f"\nTEST Channel (@{TEST_CHANNEL}):")
+            print(f"  ✅ Newly linked: {stats_test['newly_linked']}")
+            print(f"  🔄 Updated (reposted): {stats_test.get('updated_links', 0)}")
+            print(f"  💾 Cached links: {stats_test['cached_links']}")
+            print(f"  📱 Messages scanned: {stats_test['messages_scanned']}")
+
+            total_linked = stats_live['newly_linked'] + stats_test['newly_linked']
+            total_updated = stats_live.get('updated_links', 0) + stats_test.get('updated_links', 0)
+
+            if total_linked > 0 or total_updated > 0:
+                print(f"\n✨ Total changes:")
+                if total_linked > 0:
+                    print(f"   Newly linked: {total_linked}")
+                if total_updated > 0:
+                    print(f"   Updated (reposted): {total_updated}")
+    finally:
+        # Close the Notion HTTP connection pool, also when a scan failed
+        await notion.aclose()
 
 
 def main():
@@ -715,8 +1044,11 @@ Examples:
     
     # Handle cache cleaning
     if args.clean:
-        if os.path.exists(CACHE_FILE):
-            os.remove(CACHE_FILE)
+        cache_paths = (CACHE_FILE, LEGACY_CACHE_FILE, CACHE_STAMP_FILE)
+        if any(os.path.exists(path) for path in cache_paths):
+            for path in cache_paths:
+                if os.path.exists(path):
+                    os.remove(path)
             print("🗑️  Cache cleared")
         else:
             print("No cache to clear")
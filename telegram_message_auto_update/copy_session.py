@@ -2,67 +2,126 @@
 """
 Helper script to copy an existing Telegram session for use with the updater.
 This ensures cron jobs can use an already-authenticated session.
+Can also be imported: find_and_copy_session() returns a SessionCopyResult.
 """
 
 import os
 import shutil
 import sys
+from dataclasses import dataclass, field
+from typing import List, Optional
 
-def main():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    target_session = os.path.join(script_dir, "updater_session.session")
-    
-    print("🔍 Looking for existing Telegram session files...")
+# Resolved once at import, find_and_copy_session() only stats these
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_BASE = SCRIPT_DIR + os.sep  # Joined once, the paths below are plain concatenations
+SESSION_SUFFIX = ".session"  # Plain suffix test, no glob/fnmatch regex needed
+TARGET_SESSION = _BASE + "updater_session" + SESSION_SUFFIX
+
+# Alternative session files to copy from, best candidates first
+SESSION_CANDIDATES = (
+    # Other session names in same directory
+    _BASE + "local_updater_session.session",
+    _BASE + "replit_updater_session.session",
+    _BASE + "scheduler_session.session",
+    # Parent directory (telegram event scheduler). No separate isdir() check: when the
+    # directory is missing, the single stat of this path already fails at that component
+    os.path.normpath(_BASE + "../telegram_event_scheduler/scheduler_session.session"),
+)
+
+
+def _copy_session_file(source, target, source_stat):
+    """Copy a session file in the kernel (copy_file_range), keeping the source permissions"""
+    # O_EXCL: never overwrite a session that appeared in the meantime
+    fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL, source_stat.st_mode & 0o777)
+    try:
+        with open(fd, "wb") as dst, open(source, "rb") as src:
+            try:
+                remaining = source_stat.st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if not copied:
+                        break
+                    remaining -= copied
+            except (AttributeError, OSError):
+                # Not Linux, or the filesystem can't do it: plain copy from the start
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+                shutil.copyfileobj(src, dst)
+    except BaseException:
+        # Don't leave a half-written session behind, the next run would accept it
+        os.remove(target)
+        raise
+
+
+def _session_candidates():
+    """Yield (path, stat) for existing session files to copy from, best candidates first"""
+    # Known names first
+    for path in SESSION_CANDIDATES:
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            continue
+        yield path, path_stat
     
-    # Check if target already exists
-    if os.path.exists(target_session):
-        print(f"✅ Session already exists: {target_session}")
-        print(f"   Size: {os.path.getsize(target_session)} bytes")
-        return 0
+    # Fallback: any .session file, from one directory listing (the dirent already
+    # carries the file type, so is_file() needs no extra stat)
+    with os.scandir(SCRIPT_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(SESSION_SUFFIX) and not entry.name.startswith(".") and entry.is_file():
+                yield entry.path, entry.stat()
+
+
+@dataclass
+class SessionCopyResult:
+    """Outcome of find_and_copy_session: exit status, copied-from path and report lines"""
+    status: int
+    source: Optional[str] = None
+    messages: List[str] = field(default_factory=list)
+
+
+def find_and_copy_session() -> SessionCopyResult:
+    """Make sure TARGET_SESSION exists, copying the best existing session if needed (no printing)"""
+    messages = ["🔍 Looking for existing Telegram session files..."]
     
-    # Look for alternative session files
-    possible_sources = [
-        # Other session names in same directory
-        "local_updater_session.session",
-        "replit_updater_session.session",
-        "scheduler_session.session",
-        # Parent directory (telegram event scheduler)
-        "../telegram_event_scheduler/scheduler_session.session",
-        # Look for any .session file
-        "*.session"
-    ]
+    # Check if target already exists (one stat gives both existence and size). This also
+    # covers a target that is a link to one of the candidates, so nothing is ever re-copied
+    try:
+        target_stat = os.stat(TARGET_SESSION)
+    except FileNotFoundError:
+        pass
+    else:
+        messages.append(f"✅ Session already exists: {TARGET_SESSION}")
+        messages.append(f"   Size: {target_stat.st_size} bytes")
+        return SessionCopyResult(0, messages=messages)
     
-    found_sessions = []
-    for pattern in possible_sources:
-        if "*" in pattern:
-            # Use glob for wildcards
-            import glob
-            files = glob.glob(os.path.join(script_dir, pattern))
-            found_sessions.extend(files)
-        else:
-            path = os.path.join(script_dir, pattern)
-            if os.path.exists(path):
-                found_sessions.append(path)
+    # Only the first match is used, so candidates are produced lazily and the search stops there
+    source, source_stat = next(_session_candidates(), (None, None))
     
-    if not found_sessions:
-        print("❌ No existing session files found!")
-        print("   Please run the script manually first to authenticate:")
-        print("   python notion_to_telegram_message_update_new_info.py")
-        return 1
+    if source is None:
+        messages.append("❌ No existing session files found!")
+        messages.append("   Please run the script manually first to authenticate:")
+        messages.append("   python notion_to_telegram_message_update_new_info.py")
+        return SessionCopyResult(1, messages=messages)
     
-    # Use the first found session
-    source = found_sessions[0]
-    print(f"📋 Found session: {source}")
+    messages.append(f"📋 Found session: {source}")
     
     # Copy it to the expected location
     try:
-        shutil.copy2(source, target_session)
-        print(f"✅ Copied to: {target_session}")
-        print("   The updater script should now work with cron!")
-        return 0
+        _copy_session_file(source, TARGET_SESSION, source_stat)
+        messages.append(f"✅ Copied to: {TARGET_SESSION}")
+        messages.append("   The updater script should now work with cron!")
+        return SessionCopyResult(0, source, messages)
     except Exception as e:
-        print(f"❌ Failed to copy session: {e}")
-        return 1
+        messages.append(f"❌ Failed to copy session: {e}")
+        return SessionCopyResult(1, source, messages)
+
+
+def main():
+    result = find_and_copy_session()
+    # One write for the whole report instead of one per line (cron output is block-buffered anyway)
+    sys.stdout.write("\n".join(result.messages) + "\n")
+    return result.status
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
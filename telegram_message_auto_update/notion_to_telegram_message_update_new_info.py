@@ -19,7 +19,8 @@ KEY FEATURES:
 -------------
 • Change Detection: Only updates when Notion data is newer
 • Smart Comparison: Compares formatted message text to avoid unnecessary updates
-• JSON Cache: Maintains exact copy of what's on Telegram
+• JSON Cache: Maintains exact copy of what's on Telegram (one file per channel)
+• Incremental Query: After a run without errors, only pages edited since then are fetched
 • Error Handling: Gracefully handles API failures without data loss
 • Test Mode: Dry run option to preview changes without updating
 • Channel Selection: Test on test channel before going live
@@ -47,22 +48,31 @@ Options:
 """
 
 import asyncio
+import functools
 import json
 import os
-import requests
+import re
+import httpx
 import io
 import logging
+import random
 import sys
 import argparse
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass, asdict
 from telethon import TelegramClient
+from telethon.errors import FloodWaitError
 from telethon.tl.functions.messages import EditMessageRequest
 from notion_client import Client
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: faster cache encode/decode
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -94,26 +104,17 @@ logger = logging.getLogger(__name__)
 
 # Custom print function that logs and prints
 def log_print(message, level="INFO"):
-    """Print and log a message with timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    full_message = f"[{timestamp}] {message}"
-    
-    # Print to console (for manual runs)
-    print(message)
-    
-    # Log to file (for scheduled runs)
+    """Log a message to the log file and the console
+
+    Both handlers above write each record with its timestamp and flush it right away,
+    so nothing else is needed here.
+    """
     if level == "ERROR":
         logger.error(message)
     elif level == "WARNING":
         logger.warning(message)
     else:
         logger.info(message)
-    
-    # Force flush to ensure immediate writing
-    sys.stdout.flush()
-    for handler in logger.handlers:
-        if isinstance(handler, logging.FileHandler):
-            handler.flush()
 
 # Log startup
 log_print("=" * 50)
@@ -150,7 +151,22 @@ TELEGRAM_LIVE_CHANNEL = os.getenv('TELEGRAM_LIVE_CHANNEL', 'raveinbelgium')
 TELEGRAM_TEST_CHANNEL = os.getenv('TELEGRAM_TEST_CHANNEL', 'testchannel1234123434')
 
 # Cache Configuration
-CACHE_FILE = os.path.join(SCRIPT_DIR, 'telegram_messages_cache.json')
+CACHE_FILE_TEMPLATE = os.path.join(SCRIPT_DIR, 'telegram_messages_cache_{channel}.json')  # One shard per channel
+LEGACY_CACHE_FILE = os.path.join(SCRIPT_DIR, 'telegram_messages_cache.json')  # All channels, split on first load
+SYNC_STAMP_FILE = os.path.join(SCRIPT_DIR, 'telegram_sync_stamp.json')  # {channel: start of last clean run}
+
+# Notion rate limiting - the API allows an average of ~3 requests per second
+NOTION_CONCURRENCY = 3  # Max in-flight timestamp updates
+NOTION_SLOT_SECONDS = 1.0  # Each in-flight slot is held at least this long, so writes stay <= 3 req/s
+NOTION_PAGE_QUEUE_SIZE = 2  # Notion query pages fetched ahead of event parsing
+
+# Telegram edits in flight at once
+TELEGRAM_EDIT_CONCURRENCY = 4
+EDIT_MAX_ATTEMPTS = 3  # Per message, counting the first try
+FLOOD_WAIT_MAX_SECONDS = 300  # Longer flood waits fail the edit instead of stalling the run
+
+# Explain each change line by line, unless nobody is watching (--auto)
+VERBOSE_DIFF = '--auto' not in sys.argv
 
 # Session Configuration - always use the same session file name
 def get_session_file():
@@ -192,8 +208,28 @@ SESSION_FILE = get_session_file()
 
 TIMEZONE = ZoneInfo(os.getenv('TIMEZONE', 'Europe/Brussels'))
 
+_EMPTY: dict = {}  # Shared default for missing Notion properties (never mutated)
+_MONTH_ABBR = ('', 'JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
+               'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC')  # Month number -> 'JAN'..'DEC'
+
+# Precompiled patterns for message comparison
+# Links compare_and_show_changes reads out of a message: (url, label)
+_ANCHOR_RE = re.compile(r'<a href=[\'"]([^\'"]*)[\'"]>([^<]*)</a>')
+_BOLD_MD_RE = re.compile(r'\*\*([^*]+)\*\*')  # Markdown **bold**, see normalize_for_comparison
+
+
+def _make_notion_http_client() -> httpx.Client:
+    """Pooled HTTP client for Notion, shared by the worker threads that run the blocking
+    Notion calls and multiplexed over HTTP/2 when the h2 package is installed"""
+    limits = httpx.Limits(max_connections=NOTION_CONCURRENCY + 1, max_keepalive_connections=NOTION_CONCURRENCY + 1)
+    try:
+        return httpx.Client(http2=True, limits=limits)
+    except ImportError:
+        return httpx.Client(limits=limits)
+
+
 # Initialize Notion client
-notion = Client(auth=NOTION_TOKEN)
+notion = Client(auth=NOTION_TOKEN, client=_make_notion_http_client())
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -252,39 +288,107 @@ class TelegramMessage:
         )
 
 
+@dataclass(slots=True)
+class NotionEvent:
+    """An event row from Notion, normalised once at fetch time (field names match Notion)"""
+    id: str
+    title: str
+    telegram_message_id: int
+    timestamp_telegram: Optional[str]
+    last_edited_time: str
+    event_date: Optional[str]  # YYYY-MM-DD
+    until_date: Optional[str]  # YYYY-MM-DD or None
+    event_location: str
+    start_time: str
+    raw_lineup: str
+    event_url: str
+    facebook_event_url: str
+    ticketswap_url: str
+    ig_post_url: str
+    socials_img_url: str
+
+
+# NotionEvent fields mirrored into the cache's event_data (exact Notion field names)
+_EVENT_FIELDS = (
+    'title', 'event_date', 'until_date', 'event_location', 'start_time', 'raw_lineup',
+    'event_url', 'facebook_event_url', 'ticketswap_url', 'ig_post_url', 'socials_img_url'
+)
+
+
+def _make_cache_entry(event: NotionEvent, channel: str, new_text: str, synced_at: str) -> TelegramMessage:
+    """Cache entry for a message that shows new_text on Telegram as of synced_at"""
+    return TelegramMessage(
+        message_id=event.telegram_message_id,
+        channel=channel,
+        text=new_text,
+        image_url=event.socials_img_url,
+        last_updated=synced_at,
+        notion_id=event.id,
+        event_data={field: getattr(event, field) for field in _EVENT_FIELDS}
+    )
+
+
 class MessageCache:
-    """Manages the JSON cache of Telegram messages"""
+    """Manages the JSON cache of Telegram messages for one channel"""
 
-    def __init__(self, cache_file: str = None):
-        self.cache_file = cache_file or CACHE_FILE
+    def __init__(self, channel: str, cache_file: str = None):
+        self.channel = channel
+        self.cache_file = cache_file or CACHE_FILE_TEMPLATE.format(channel=channel)
         self.messages: Dict[str, TelegramMessage] = {}  # Changed to use string keys
+        self._dirty: set = set()  # Keys updated since the last save
         self.load()
 
     def load(self):
-        """Load cache from JSON file"""
-        if os.path.exists(self.cache_file):
+        """Load this channel's shard, or its entries from the legacy all-channel cache the first time"""
+        migrating = not os.path.exists(self.cache_file) and os.path.exists(LEGACY_CACHE_FILE)
+        path = LEGACY_CACHE_FILE if migrating else self.cache_file
+        if os.path.exists(path):
+            loads = orjson.loads if orjson else json.loads
+            prefix = f"{self.channel}:"
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(path, 'rb') as f:
+                    data = loads(f.read())
                     for key, msg_data in data.items():
-                        self.messages[key] = TelegramMessage.from_dict(msg_data)
-                log_print(f"📦 Loaded {len(self.messages)} cached messages")
+                        if key.startswith(prefix):
+                            self.messages[key] = TelegramMessage.from_dict(msg_data)
+                if migrating:
+                    # Written to the shard on the next save; the legacy file still holds the other channels
+                    self._dirty.update(self.messages)
+                    log_print(f"📦 Migrated {len(self.messages)} cached messages from {os.path.basename(LEGACY_CACHE_FILE)}")
+                else:
+                    log_print(f"📦 Loaded {len(self.messages)} cached messages")
             except Exception as e:
                 log_print(f"⚠️  Cache load error: {e}. Starting fresh.", "WARNING")
                 self.messages = {}
 
     def save(self):
-        """Save cache to JSON file with clean structure"""
+        """Save cache to JSON file with clean structure (skipped when nothing was updated)"""
+        if not self._dirty:
+            log_print("💾 Cache unchanged, nothing to save")
+            return
+        tmp_path = self.cache_file + '.tmp'
         try:
             data = {
                 key: msg.to_dict()
                 for key, msg in self.messages.items()
             }
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Both encoders produce the same bytes: 2-space indent, non-ASCII kept as UTF-8
+            if orjson:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+            # Write to a temp file and swap it in so a crash never leaves a torn cache
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.cache_file)
+            self._dirty.clear()
             log_print(f"💾 Saved {len(self.messages)} messages to cache")
         except Exception as e:
             log_print(f"❌ Cache save error: {e}", "ERROR")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
     def get(self, channel: str, message_id: int) -> Optional[TelegramMessage]:
         """Get a cached message using channel:id as key"""
@@ -295,6 +399,7 @@ class MessageCache:
         """Update or add a message to cache"""
         key = f"{message.channel}:{message.message_id}"
         self.messages[key] = message
+        self._dirty.add(key)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -313,27 +418,81 @@ def safe_get_url(prop: dict) -> str:
     return prop.get("url") or ""
 
 
+@functools.lru_cache(maxsize=2048)
 def parse_notion_date(date_str: str) -> Optional[datetime]:
-    """Parse Notion date string to datetime"""
+    """Parse Notion date string to datetime (memoized - the returned datetimes are immutable)"""
     if not date_str:
         return None
     try:
         # Handle both date and datetime formats
         if 'T' in date_str:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            if date_str.endswith('Z'):
+                return datetime.fromisoformat(date_str[:-1]).replace(tzinfo=timezone.utc)
+            return datetime.fromisoformat(date_str)
         else:
             return datetime.strptime(date_str, '%Y-%m-%d')
     except:
         return None
 
 
-def fetch_events_with_telegram_ids(channel: str) -> List[dict]:
-    """Fetch all events that have telegram_message_id or telegram_test_channel_id from Notion"""
+def load_sync_watermark(channel: str) -> Optional[str]:
+    """Return the Notion last_edited_time lower bound for an incremental query, or None for a full one.
+
+    The stored value is the start of the last run that finished without errors. Notion truncates
+    last_edited_time to the minute, so the bound is rounded down to the minute and pulled back one
+    more minute to absorb clock skew between this machine and Notion.
+    """
+    if not os.path.exists(SYNC_STAMP_FILE):
+        return None
+    try:
+        with open(SYNC_STAMP_FILE, 'r', encoding='utf-8') as f:
+            started_at = json.load(f).get(channel)
+        if not started_at:
+            return None
+        bound = datetime.fromisoformat(started_at).replace(second=0, microsecond=0) - timedelta(minutes=1)
+        return bound.isoformat()
+    except Exception as e:
+        log_print(f"⚠️  Sync stamp load error: {e}. Doing a full query.", "WARNING")
+        return None
+
+
+def save_sync_watermark(channel: str, started_at: datetime):
+    """Record the start of a clean run so the next run only queries pages edited since then"""
+    try:
+        stamps = {}
+        if os.path.exists(SYNC_STAMP_FILE):
+            with open(SYNC_STAMP_FILE, 'r', encoding='utf-8') as f:
+                stamps = json.load(f)
+        stamps[channel] = started_at.isoformat()
+        with open(SYNC_STAMP_FILE, 'w', encoding='utf-8') as f:
+            json.dump(stamps, f, indent=2)
+    except Exception as e:
+        log_print(f"⚠️  Sync stamp save error: {e}", "WARNING")
+
+
+async def _produce_notion_pages(queue: asyncio.Queue, params: dict):
+    """Page through a Notion database query into the queue, ending with a None sentinel"""
+    try:
+        while True:
+            response = await asyncio.to_thread(notion.databases.query, **params)
+            await queue.put(response["results"])
+            if not response.get("has_more"):
+                break
+            params = {**params, "start_cursor": response.get("next_cursor")}
+    finally:
+        await queue.put(None)
+
+
+async def fetch_events_with_telegram_ids(channel: str, edited_since: Optional[str] = None) -> List[NotionEvent]:
+    """Fetch all events that have telegram_message_id or telegram_test_channel_id from Notion
+
+    With edited_since set, only pages whose last_edited_time is on or after it are returned.
+    """
     events = []
-    has_more = True
-    cursor = None
 
     log_print("Querying Notion database...")
+    if edited_since:
+        print(f"Only pages edited since {edited_since}")
 
     # Get today's date for filtering
     today = datetime.now().date()
@@ -346,43 +505,50 @@ def fetch_events_with_telegram_ids(channel: str) -> List[dict]:
         id_field = "telegram_message_id"
         print(f"Looking for events with {id_field}...")
 
-    while has_more:
-        # Query with pagination - filter by the appropriate ID field
-        params = {
-            "database_id": NOTION_MASTER_DB_ID,
-            "filter": {
-                "and": [
-                    {
-                        "property": id_field,
-                        "number": {"is_not_empty": True}
-                    },
-                    {
-                        "property": "event_date",
-                        "date": {"on_or_after": today.isoformat()}
-                    }
-                ]
-            }
+    filters = [
+        {
+            "property": id_field,
+            "number": {"is_not_empty": True}
+        },
+        {
+            "property": "event_date",
+            "date": {"on_or_after": today.isoformat()}
         }
-        if cursor:
-            params["start_cursor"] = cursor
+    ]
+    if edited_since:
+        # Incremental sync - let Notion drop the pages nobody touched since the last clean run
+        filters.append({
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": edited_since}
+        })
+
+    # Query with pagination - filter by the appropriate ID field. Pages are fetched by a
+    # producer task, so the next page is already in flight while the current one is parsed here
+    params = {
+        "database_id": NOTION_MASTER_DB_ID,
+        "filter": {"and": filters}
+    }
+    queue: asyncio.Queue = asyncio.Queue(maxsize=NOTION_PAGE_QUEUE_SIZE)
+    producer = asyncio.create_task(_produce_notion_pages(queue, params))
 
-        response = notion.databases.query(**params)
+    # Bound once for the per-row loop below
+    text_of = safe_get_text
+    url_of = safe_get_url
+    parse_date = date.fromisoformat
 
+    while (results := await queue.get()) is not None:
         # Process each event
-        for item in response["results"]:
-            p = item["properties"]
+        for item in results:
+            get = item["properties"].get
 
             # Get the appropriate telegram ID based on channel
-            if channel == TELEGRAM_TEST_CHANNEL:
-                telegram_id = p.get("telegram_test_channel_id", {}).get("number")
-            else:
-                telegram_id = p.get("telegram_message_id", {}).get("number")
+            telegram_id = get(id_field, _EMPTY).get("number")
 
             if not telegram_id:
                 continue
 
             # Get title
-            title_items = p.get("title", {}).get("title", [])
+            title_items = get("title", _EMPTY).get("title")
             if not title_items:
                 print(f"⚠️  Skipping event with telegram_id {telegram_id} – no title")
                 continue
@@ -390,12 +556,8 @@ def fetch_events_with_telegram_ids(channel: str) -> List[dict]:
 
             try:
                 # Get timestamps
-                timestamp_telegram_prop = p.get("timestamp_telegram", {})
-                if timestamp_telegram_prop:
-                    date_prop = timestamp_telegram_prop.get("date")
-                    timestamp_telegram = date_prop.get("start") if date_prop else None
-                else:
-                    timestamp_telegram = None
+                date_prop = get("timestamp_telegram", _EMPTY).get("date")
+                timestamp_telegram = date_prop.get("start") if date_prop else None
                 last_edited = item.get("last_edited_time")
 
                 # Skip if we can't determine if update is needed
@@ -404,75 +566,65 @@ def fetch_events_with_telegram_ids(channel: str) -> List[dict]:
                     continue
 
                 # Get event data - store raw Notion values
-                event_date_prop = p.get("event_date", {})
-                event_date = event_date_prop.get("date", {}).get("start") if event_date_prop.get("date") else None
+                date_prop = get("event_date", _EMPTY).get("date")
+                event_date = date_prop.get("start") if date_prop else None
 
                 # Skip past events
                 if event_date:
-                    event_date_obj = datetime.strptime(event_date, '%Y-%m-%d').date()
-                    if event_date_obj < today:
+                    if parse_date(event_date) < today:
                         print(f"⚠️  Skipping '{title}' – event date in the past")
                         continue
 
-                until_date_prop = p.get("until_date", {})
-                until_date = until_date_prop.get("date", {}).get("start") if until_date_prop.get("date") else None
+                date_prop = get("until_date", _EMPTY).get("date")
+                until_date = date_prop.get("start") if date_prop else None
 
-                location = safe_get_text(p.get("event_location", {}).get("rich_text", []))
-                start_time = safe_get_text(p.get("start_time", {}).get("rich_text", []))
-                lineup_rt = p.get("raw_lineup", {}).get("rich_text", [])
+                location = text_of(get("event_location", _EMPTY).get("rich_text"))
+                start_time = text_of(get("start_time", _EMPTY).get("rich_text"))
+                lineup_rt = get("raw_lineup", _EMPTY).get("rich_text")
                 lineup = lineup_rt[0]["plain_text"] if lineup_rt else ""
 
                 # Get URLs
-                event_url = safe_get_url(p.get("event_url", {}))
-                fb_url = safe_get_url(p.get("facebook_event_url", {}))
-                swap_url = safe_get_url(p.get("ticketswap_url", {}))
-                image_url = safe_get_url(p.get("socials_img_url", {}))
-                ig_url = safe_get_url(p.get("ig_post_url", {}))
-
-                events.append({
-                    "id": item["id"],
-                    "title": title,
-                    "telegram_message_id": int(telegram_id),
-                    "timestamp_telegram": timestamp_telegram,
-                    "last_edited_time": last_edited,
-                    # Raw Notion values
-                    "event_date": event_date,  # Keep as YYYY-MM-DD
-                    "until_date": until_date,   # Keep as YYYY-MM-DD or None
-                    "event_location": location,  # Match Notion field name
-                    "start_time": start_time,
-                    "raw_lineup": lineup,  # Match Notion field name
-                    "event_url": event_url,
-                    "facebook_event_url": fb_url,  # Match Notion field name
-                    "ticketswap_url": swap_url,    # Match Notion field name
-                    "ig_post_url": ig_url,         # Match Notion field name
-                    "socials_img_url": image_url,  # Match Notion field name
-                    # Keep simplified versions for backward compatibility
-                    "date": event_date,
-                    "location": location,
-                    "lineup": lineup,
-                    "fb_url": fb_url,
-                    "swap_url": swap_url,
-                    "ig_url": ig_url,
-                    "image_url": image_url
-                })
+                event_url = url_of(get("event_url", _EMPTY))
+                fb_url = url_of(get("facebook_event_url", _EMPTY))
+                swap_url = url_of(get("ticketswap_url", _EMPTY))
+                image_url = url_of(get("socials_img_url", _EMPTY))
+                ig_url = url_of(get("ig_post_url", _EMPTY))
+
+                events.append(NotionEvent(
+                    id=item["id"],
+                    title=title,
+                    telegram_message_id=int(telegram_id),
+                    timestamp_telegram=timestamp_telegram,
+                    last_edited_time=last_edited,
+                    event_date=event_date,
+                    until_date=until_date,
+                    event_location=location,
+                    start_time=start_time,
+                    raw_lineup=lineup,
+                    event_url=event_url,
+                    facebook_event_url=fb_url,
+                    ticketswap_url=swap_url,
+                    ig_post_url=ig_url,
+                    socials_img_url=image_url
+                ))
             except Exception as e:
                 print(f"❌ Error processing '{title}': {e}")
                 continue
 
-        has_more = response.get("has_more", False)
-        cursor = response.get("next_cursor")
+    await producer  # Re-raises a Notion error that ended the query early
 
     return events
 
 
-def update_notion_timestamp(event_id: str):
-    """Update timestamp_telegram in Notion after successful sync"""
+async def update_notion_timestamp(event_id: str, synced_at: str) -> bool:
+    """Update timestamp_telegram in Notion after successful sync (the blocking call runs in a worker thread)"""
     try:
-        notion.pages.update(
+        await asyncio.to_thread(
+            notion.pages.update,
             page_id=event_id,
             properties={
                 "timestamp_telegram": {
-                    "date": {"start": datetime.now(TIMEZONE).isoformat()}
+                    "date": {"start": synced_at}
                 }
             }
         )
@@ -482,6 +634,29 @@ def update_notion_timestamp(event_id: str):
         return False
 
 
+async def _update_notion_timestamp_limited(semaphore: asyncio.Semaphore, event_id: str, synced_at: str) -> bool:
+    """Run update_notion_timestamp while holding a slot of the given semaphore for at least NOTION_SLOT_SECONDS"""
+    async with semaphore:
+        started = asyncio.get_running_loop().time()
+        success = await update_notion_timestamp(event_id, synced_at)
+        remaining = NOTION_SLOT_SECONDS - (asyncio.get_running_loop().time() - started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return success
+
+
+async def flush_notion_timestamps(pending: Dict[str, str]) -> int:
+    """Write the collected {event_id: synced_at} timestamps to Notion concurrently, returns the number written"""
+    if not pending:
+        return 0
+    semaphore = asyncio.Semaphore(NOTION_CONCURRENCY)
+    results = await asyncio.gather(*(
+        _update_notion_timestamp_limited(semaphore, event_id, synced_at)
+        for event_id, synced_at in pending.items()
+    ))
+    return sum(results)
+
+
 # ═══════════════════════════════════════════════════════════════
 # MESSAGE FORMATTING
 # ═══════════════════════════════════════════════════════════════
@@ -491,89 +666,100 @@ def format_event_date(date_str: str, until_str: Optional[str]) -> str:
     if not date_str:
         return "DATE TBA"
 
-    start_date = datetime.strptime(date_str, '%Y-%m-%d')
+    start_date = date.fromisoformat(date_str)
+    start_month = _MONTH_ABBR[start_date.month]
 
     if until_str:
-        until_date = datetime.strptime(until_str, '%Y-%m-%d')
+        until_date = date.fromisoformat(until_str)
         if start_date.month == until_date.month:
-            return f"{start_date.day}-{until_date.day} {start_date.strftime('%b').upper()}"
+            return f"{start_date.day}-{until_date.day} {start_month}"
         else:
-            return f"{start_date.day} {start_date.strftime('%b').upper()} - {until_date.day} {until_date.strftime('%b').upper()}"
+            return f"{start_date.day} {start_month} - {until_date.day} {_MONTH_ABBR[until_date.month]}"
     else:
-        return f"{start_date.day} {start_date.strftime('%b').upper()}"
+        return f"{start_date.day} {start_month}"
 
 
-def build_message_text(event: dict) -> str:
+def build_message_text(event: NotionEvent) -> str:
     """Build the Telegram message text with proper formatting"""
     # Handle date formatting
-    formatted_date = format_event_date(event.get('date') or event.get('event_date'),
-                                       event.get('until_date'))
+    formatted_date = format_event_date(event.event_date, event.until_date)
 
     # Build links section - dynamically include only non-empty URLs
     links = []
 
     # Facebook link
-    fb_url = event.get('fb_url') or event.get('facebook_event_url')
+    fb_url = event.facebook_event_url
     if fb_url and fb_url.strip():
         links.append(f"<a href='{fb_url}'>Facebook</a>")
 
     # Tickets/Event URL
-    event_url = event.get('event_url')
+    event_url = event.event_url
     if event_url and event_url.strip():
         links.append(f"<a href='{event_url}'>Tickets</a>")
 
-    # Ticketswap URL - IMPORTANT: Check both field names
-    swap_url = event.get('swap_url') or event.get('ticketswap_url')
+    # Ticketswap URL
+    swap_url = event.ticketswap_url
     if swap_url and swap_url.strip():
         links.append(f"<a href='{swap_url}'>Ticketswap</a>")
 
     # Build the message
-    title = event.get('title', 'Event')
-    location = event.get('location') or event.get('event_location', 'TBA')
-    start_time = event.get('start_time', 'TBA')
-    lineup = event.get('lineup') or event.get('raw_lineup', '')
-
-    msg_text = f"<b>{formatted_date} | {title}</b>\n"
-    msg_text += f"{location} • Starts at {start_time}\n\n"
+    title = event.title
+    location = event.event_location
+    start_time = event.start_time
+    lineup = event.raw_lineup
+
+    # Collected as parts and joined once at the end
+    parts = [
+        f"<b>{formatted_date} | {title}</b>\n",
+        f"{location} • Starts at {start_time}\n\n"
+    ]
 
     # Only add lineup if it exists and isn't empty
     if lineup and lineup.strip() and lineup != "Lineup TBA":
-        msg_text += f"Lineup: {lineup}\n\n"
+        parts.append(f"Lineup: {lineup}\n\n")
 
     # Add main links if any exist
     if links:
-        links_text = " | ".join(links)
-        msg_text += links_text
+        parts.append(" | ".join(links))
 
     # Instagram gets special treatment - separate line at the bottom with share-like icon and IG link
-    ig_url = event.get('ig_url') or event.get('ig_post_url')
+    ig_url = event.ig_post_url
     if ig_url and ig_url.strip():
         if links:  # Add spacing if there were other links
-            msg_text += "\n\n"
-        msg_text += f"<a href='{ig_url}'>↗ IG</a>"
+            parts.append("\n\n")
+        parts.append(f"<a href='{ig_url}'>↗ IG</a>")
 
-    return msg_text
+    return "".join(parts)
 
 
 # ═══════════════════════════════════════════════════════════════
 # TELEGRAM OPERATIONS
 # ═══════════════════════════════════════════════════════════════
 
-async def get_telegram_message(client: TelegramClient, channel: str, message_id: int) -> Optional[str]:
-    """Fetch current message text from Telegram"""
+async def get_telegram_messages(client: TelegramClient, channel_entity, message_ids: List[int]) -> Optional[Dict[int, Optional[str]]]:
+    """Fetch the current text of several messages from Telegram in one batched request
+
+    Returns {message_id: text}, with None for messages that no longer exist, or None when the
+    request itself failed (so a transport error is never mistaken for deleted messages).
+    """
+    if not message_ids:
+        return {}
     try:
-        message = await client.get_messages(channel, ids=message_id)
-        if message:
-            return message.text or message.caption
-        return None
+        messages = await client.get_messages(channel_entity, ids=message_ids)
     except Exception as e:
-        print(f"❌ Error fetching message {message_id}: {e}")
+        print(f"❌ Error fetching messages {message_ids}: {e}")
         return None
+    # Message.text covers media captions too; an existing post without text maps to '' so only
+    # messages that are really gone come back as None
+    return {
+        message_id: (message.text or '') if message else None
+        for message_id, message in zip(message_ids, messages)
+    }
 
 
 async def update_telegram_message(
     client: TelegramClient,
-    channel: str,
+    channel_entity,
     message_id: int,
     new_text: str
 ) -> bool:
@@ -581,69 +767,101 @@ async def update_telegram_message(
     
     Note: Telegram does not allow updating images in existing messages.
     Only the text/caption can be modified.
+    channel_entity is resolved once per sync by the caller.
+
+    Flood waits are honoured (Telethon already sleeps through the short ones itself) and
+    network errors are retried with jittered exponential backoff, up to EDIT_MAX_ATTEMPTS tries.
     """
-    try:
-        # Get the channel entity
-        channel_entity = await client.get_entity(channel)
-
-        # Edit the message (text only)
-        await client.edit_message(
-            channel_entity,
-            message_id,
-            text=new_text,
-            parse_mode='html',
-            link_preview=False
-        )
+    for attempt in range(1, EDIT_MAX_ATTEMPTS + 1):
+        try:
+            # Edit the message (text only)
+            await client.edit_message(
+                channel_entity,
+                message_id,
+                text=new_text,
+                parse_mode='html',
+                link_preview=False
+            )
 
-        return True
-    except Exception as e:
-        # Let the caller handle specific errors
-        if "Content of the message was not modified" in str(e):
-            raise e  # Re-raise for special handling
-        print(f"❌ Error updating message {message_id}: {e}")
-        return False
+            return True
+        except FloodWaitError as e:
+            if attempt == EDIT_MAX_ATTEMPTS or e.seconds > FLOOD_WAIT_MAX_SECONDS:
+                print(f"❌ Error updating message {message_id}: {e}")
+                return False
+            print(f"⏳ Flood wait on message {message_id}, retrying in {e.seconds + 1}s")
+            await asyncio.sleep(e.seconds + 1)
+        except (ConnectionError, asyncio.TimeoutError) as e:
+            if attempt == EDIT_MAX_ATTEMPTS:
+                print(f"❌ Error updating message {message_id}: {e}")
+                return False
+            delay = min(30, 2 ** attempt) + random.random()
+            print(f"⚠️  Network error on message {message_id} ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        except Exception as e:
+            # Let the caller handle specific errors
+            if "Content of the message was not modified" in str(e):
+                raise e  # Re-raise for special handling
+            print(f"❌ Error updating message {message_id}: {e}")
+            return False
 
 
-async def check_needs_update(event: dict, cache: MessageCache, channel: str) -> Tuple[bool, str]:
+async def check_needs_update(event: NotionEvent, cache: MessageCache, channel: str) -> Tuple[bool, str, Optional[str]]:
     """
     Check if an event needs updating
-    Returns: (needs_update, reason)
+    Returns: (needs_update, reason, new_text)
+
+    The cheap timestamp checks run first; the message text is only built when they can't
+    decide, and is returned so the caller doesn't have to build it again (None otherwise).
     """
     # First check if we have this in cache
-    cached_msg = cache.get(channel, event['telegram_message_id'])
+    cached_msg = cache.get(channel, event.telegram_message_id)
     if not cached_msg:
         # Always need to sync if not in cache, regardless of timestamps
-        return True, "Not in cache (rebuilding)"
+        return True, "Not in cache (rebuilding)", None
 
     # Check if Notion was edited after last Telegram update
-    last_edited = parse_notion_date(event['last_edited_time'])
-    timestamp_telegram = parse_notion_date(event.get('timestamp_telegram'))
+    last_edited = parse_notion_date(event.last_edited_time)
+    timestamp_telegram = parse_notion_date(event.timestamp_telegram)
 
     if not last_edited:
-        return False, "No last_edited_time"
+        return False, "No last_edited_time", None
 
     # If never synced to Telegram, needs update
     if not timestamp_telegram:
-        return True, "Never synced to Telegram"
+        return True, "Never synced to Telegram", None
 
     # If Notion not edited since last sync, skip
     if last_edited <= timestamp_telegram:
-        return False, "No changes since last sync"
+        return False, "No changes since last sync", None
 
     # Compare message text
     new_text = build_message_text(event)
     if cached_msg.text != new_text:
-        return True, "Message content changed"
+        return True, "Message content changed", new_text
 
     # Check if image changed
-    if event.get('image_url') != cached_msg.image_url:
-        return True, "Image URL changed"
+    if event.socials_img_url != cached_msg.image_url:
+        return True, "Image URL changed", new_text
 
-    return False, "No changes detected"
+    return False, "No changes detected", new_text
 
 
-def compare_and_show_changes(current_text: str, new_text: str, event: dict = None) -> bool:
-    """Compare texts and show what changed"""
+def _no_print(*args, **kwargs):
+    """Stand-in for print when a diff is computed without being shown"""
+
+
+def normalize_for_comparison(text: str) -> str:
+    """Normalize text to handle both markdown and HTML bold formats"""
+    if not text:
+        return ""
+    # Convert markdown **text** to <b>text</b> for comparison
+    return _BOLD_MD_RE.sub(r'<b>\1</b>', text.strip())
+
+
+def compare_and_show_changes(current_text: str, new_text: str, event: Optional[NotionEvent] = None) -> bool:
+    """Compare texts and show what changed (the same decision either way, printed only when VERBOSE_DIFF is on)"""
+    show = print if VERBOSE_DIFF else _no_print
+
     current_lines = current_text.strip().split('\n') if current_text else []
     new_lines = new_text.strip().split('\n') if new_text else []
 
@@ -651,17 +869,21 @@ def compare_and_show_changes(current_text: str, new_text: str, event: dict = Non
 
     # Check for specific link changes if event data provided
     if event:
-        # Extract current links from the message
-        current_has_fb = 'Facebook</a>' in current_text
-        current_has_tickets = 'Tickets</a>' in current_text
-        current_has_swap = 'Ticketswap</a>' in current_text
-        current_has_ig = '↗ IG</a>' in current_text
-
-        # Check new links - being careful with field names
-        new_has_fb = bool(event.get('fb_url') or event.get('facebook_event_url'))
-        new_has_tickets = bool(event.get('event_url'))
-        new_has_swap = bool(event.get('swap_url') or event.get('ticketswap_url'))
-        new_has_ig = bool(event.get('ig_url') or event.get('ig_post_url'))
+        # Extract current links from the message in one pass: {label: url}
+        current_links = {label: url for url, label in _ANCHOR_RE.findall(current_text)}
+        current_has_fb = 'Facebook' in current_links
+        current_has_tickets = 'Tickets' in current_links
+        current_has_swap = 'Ticketswap' in current_links
+        current_has_ig = '↗ IG' in current_links
+
+        # Check new links
+        new_fb_url = event.facebook_event_url
+        new_swap_url = event.ticketswap_url
+        new_ig_url = event.ig_post_url
+        new_has_fb = bool(new_fb_url)
+        new_has_tickets = bool(event.event_url)
+        new_has_swap = bool(new_swap_url)
+        new_has_ig = bool(new_ig_url)
 
         # Track if any link changes occurred
         link_changes = []
@@ -697,44 +919,36 @@ def compare_and_show_changes(current_text: str, new_text: str, event: dict = Non
 
         # Show link changes summary if any occurred
         if link_changes:
-            print("   🔗 Link changes:")
+            show("   🔗 Link changes:")
             for change in link_changes:
-                print(change)
+                show(change)
 
         # Also check if URLs themselves changed (not just added/removed)
         if current_has_fb and new_has_fb:
-            # Extract actual URLs to compare
-            import re
-            current_fb_match = re.search(r'href=[\'"]([^\'"]*facebook[^\'"]*)[\'"]', current_text)
-            new_fb_url = event.get('fb_url') or event.get('facebook_event_url')
-            if current_fb_match and current_fb_match.group(1) != new_fb_url:
-                print("   🔄 Facebook URL changed")
+            # Compare the actual URLs
+            if current_links['Facebook'] != new_fb_url:
+                show("   🔄 Facebook URL changed")
                 has_changes = True
 
         # Check Ticketswap URL specifically
         if current_has_swap and new_has_swap:
-            import re
-            current_swap_match = re.search(r'href=[\'"]([^\'"]*ticketswap[^\'"]*)[\'"]', current_text)
-            new_swap_url = event.get('swap_url') or event.get('ticketswap_url')
-            if current_swap_match and current_swap_match.group(1) != new_swap_url:
-                print("   🔄 Ticketswap URL changed")
+            if current_links['Ticketswap'] != new_swap_url:
+                show("   🔄 Ticketswap URL changed")
                 has_changes = True
 
         # Check Instagram URL specifically - handle both missing and changed URLs
-        new_ig_url = event.get('ig_url') or event.get('ig_post_url')
         if new_ig_url:  # If we have an IG URL in Notion
             if not current_has_ig:
                 # IG URL exists in Notion but missing from Telegram message
-                print("   ➕ Instagram URL missing from message - will add it")
+                show("   ➕ Instagram URL missing from message - will add it")
                 has_changes = True
             else:
                 # Both have IG, check if URL changed
-                import re
-                current_ig_match = re.search(r'href=[\'"]([^\'"]+)[\'"]>↗ IG</a>', current_text)
-                if current_ig_match and current_ig_match.group(1) != new_ig_url:
-                    print("   🔄 Instagram URL changed")
-                    print(f"      From: {current_ig_match.group(1)}")
-                    print(f"      To:   {new_ig_url}")
+                current_ig_url = current_links['↗ IG']
+                if current_ig_url != new_ig_url:
+                    show("   🔄 Instagram URL changed")
+                    show(f"      From: {current_ig_url}")
+                    show(f"      To:   {new_ig_url}")
                     has_changes = True
 
     # Check for other non-link changes
@@ -745,37 +959,37 @@ def compare_and_show_changes(current_text: str, new_text: str, event: dict = Non
     for i, (curr, new) in enumerate(zip(current_lines, new_lines)):
         if curr != new:
             if i == 0 and not title_changed:  # Title/date line
-                print(f"   📅 Title/Date changed")
-                print(f"      From: {curr[:60]}...")
-                print(f"      To:   {new[:60]}...")
+                show(f"   📅 Title/Date changed")
+                show(f"      From: {curr[:60]}...")
+                show(f"      To:   {new[:60]}...")
                 title_changed = True
                 has_changes = True
             elif ("Lineup:" in curr or "Lineup:" in new) and not lineup_changed:
                 if "Lineup:" not in curr and "Lineup:" in new:
-                    print(f"   ➕ Added lineup: {new[:60]}...")
+                    show(f"   ➕ Added lineup: {new[:60]}...")
                 elif "Lineup:" in curr and "Lineup:" not in new:
-                    print(f"   ➖ Removed lineup")
+                    show(f"   ➖ Removed lineup")
                 else:
-                    print(f"   🎵 Lineup changed")
-                    print(f"      From: {curr[:60]}...")
-                    print(f"      To:   {new[:60]}...")
+                    show(f"   🎵 Lineup changed")
+                    show(f"      From: {curr[:60]}...")
+                    show(f"      To:   {new[:60]}...")
                 lineup_changed = True
                 has_changes = True
             elif i == 1 and not location_changed:  # Location/time line
                 # Only show if it's actually different and not a link line
                 if "href=" not in curr and "href=" not in new:
-                    print(f"   📍 Location/Time changed")
-                    print(f"      From: {curr}")
-                    print(f"      To:   {new}")
+                    show(f"   📍 Location/Time changed")
+                    show(f"      From: {curr}")
+                    show(f"      To:   {new}")
                     location_changed = True
                     has_changes = True
 
     # Check for structural changes
     if len(new_lines) > len(current_lines) and not has_changes:
-        print(f"   ➕ Added {len(new_lines) - len(current_lines)} lines")
+        show(f"   ➕ Added {len(new_lines) - len(current_lines)} lines")
         has_changes = True
     elif len(current_lines) > len(new_lines) and not has_changes:
-        print(f"   ➖ Removed {len(current_lines) - len(new_lines)} lines")
+        show(f"   ➖ Removed {len(current_lines) - len(new_lines)} lines")
         has_changes = True
 
     return has_changes
@@ -790,9 +1004,19 @@ async def sync_events(channel: str, test_mode: bool = False):
     print("\n📊 FETCHING EVENTS FROM NOTION")
     print("=" * 50)
 
-    events = fetch_events_with_telegram_ids(channel)
+    run_started = datetime.now(timezone.utc)
+
+    # Load cache
+    cache = MessageCache(channel)
+
+    # An empty cache has to be rebuilt from every event, so only go incremental when it has entries
+    edited_since = load_sync_watermark(channel) if cache.messages else None
+
+    events = await fetch_events_with_telegram_ids(channel, edited_since)
     if not events:
-        if channel == TELEGRAM_TEST_CHANNEL:
+        if edited_since:
+            print("✅ No events edited since the last sync")
+        elif channel == TELEGRAM_TEST_CHANNEL:
             print("❌ No events found with telegram_test_channel_id")
         else:
             print("❌ No events found with telegram_message_id")
@@ -800,18 +1024,27 @@ async def sync_events(channel: str, test_mode: bool = False):
 
     print(f"✅ Found {len(events)} events with Telegram IDs for {channel}")
 
-    # Load cache
-    cache = MessageCache()
-
     # Statistics
     stats = {
         "checked": 0,
         "updated": 0,
         "skipped": 0,
         "errors": 0,
+        "deleted": 0,  # Errors for messages a successful fetch came back without (also counted in "errors")
         "identical": 0
     }
 
+    # Notion timestamps waiting to be written ({event_id: synced_at})
+    pending_timestamps: Dict[str, str] = {}
+    timestamp_stats = {"queued": 0, "written": 0}
+
+    async def flush_pending_timestamps():
+        """Write the timestamps queued so far and take them off the queue"""
+        batch = dict(pending_timestamps)
+        pending_timestamps.clear()
+        timestamp_stats["queued"] += len(batch)
+        timestamp_stats["written"] += await flush_notion_timestamps(batch)
+
     print("\n🔄 CHECKING FOR UPDATES")
     print("=" * 50)
 
@@ -844,36 +1077,74 @@ async def sync_events(channel: str, test_mode: bool = False):
             async with TelegramClient(SESSION_FILE, api_id, api_hash) as client:
                 # If we get here, connection succeeded
                 log_print("✅ Connected to Telegram successfully")
+
+                # One "synced at" stamp for every cache entry and Notion timestamp of this run
+                now_iso = datetime.now(TIMEZONE).isoformat()
                 
+                # Decide locally which events need a look at Telegram
+                candidates = []
                 for event in events:
                     stats["checked"] += 1
 
                     # Check if update needed
-                    needs_update, reason = await check_needs_update(event, cache, channel)
+                    needs_update, reason, new_text = await check_needs_update(event, cache, channel)
 
                     if not needs_update:
-                        print(f"⏭️  {event['title'][:30]}... - {reason}")
+                        print(f"⏭️  {event.title[:30]}... - {reason}")
                         stats["skipped"] += 1
                         continue
 
-                    print(f"\n📝 {event['title']}")
-                    print(f"   Message ID: {event['telegram_message_id']}")
-                    print(f"   Reason: {reason}")
-
                     if test_mode:
+                        print(f"\n📝 {event.title}")
+                        print(f"   Message ID: {event.telegram_message_id}")
+                        print(f"   Reason: {reason}")
                         print("   [TEST MODE] Would update this message")
                         stats["updated"] += 1
                         continue
 
-                    # Get current message from Telegram
-                    current_text = await get_telegram_message(client, channel, event['telegram_message_id'])
+                    # A cached message that already matches what we'd send only lacks its Notion
+                    # timestamp, so there's no need to read it back from Telegram
+                    if reason == "Never synced to Telegram":
+                        new_text = build_message_text(event)
+                        cached_msg = cache.get(channel, event.telegram_message_id)
+                        if cached_msg.text == new_text and cached_msg.image_url == event.socials_img_url:
+                            print(f"✅ {event.title[:30]}... - Content identical (cached)")
+                            stats["identical"] += 1
+                            pending_timestamps[event.id] = now_iso
+                            continue
+
+                    candidates.append((event, reason, new_text))
+
+                # Resolve the channel once for every read and edit below
+                channel_entity = await client.get_input_entity(channel) if candidates else None
+
+                # Get the current messages from Telegram in one batched request
+                current_texts = await get_telegram_messages(
+                    client, channel_entity, [event.telegram_message_id for event, _, _ in candidates]
+                )
+
+                # Show what changed and collect the messages that need an edit
+                edits = []
+                for event, reason, new_text in candidates:
+                    print(f"\n📝 {event.title}")
+                    print(f"   Message ID: {event.telegram_message_id}")
+                    print(f"   Reason: {reason}")
+
+                    if current_texts is None:
+                        print(f"   ❌ Could not fetch the message from Telegram")
+                        stats["errors"] += 1
+                        continue
+
+                    current_text = current_texts.get(event.telegram_message_id)
                     if current_text is None:
                         print(f"   ❌ Message not found on Telegram")
                         stats["errors"] += 1
+                        stats["deleted"] += 1
                         continue
 
-                    # Build new message text
-                    new_text = build_message_text(event)
+                    # Build new message text (unless check_needs_update already did)
+                    if new_text is None:
+                        new_text = build_message_text(event)
 
                     # Show detailed changes (but not if we're just rebuilding cache)
                     if reason == "Not in cache (rebuilding)":
@@ -882,18 +1153,6 @@ async def sync_events(channel: str, test_mode: bool = False):
                     else:
                         has_changes = compare_and_show_changes(current_text, new_text, event)
 
-                    # Normalize text for comparison (handle markdown vs HTML bold formats)
-                    def normalize_for_comparison(text):
-                        """Normalize text to handle both markdown and HTML bold formats"""
-                        if not text:
-                            return ""
-                        # Convert markdown bold to HTML bold for comparison
-                        import re
-                        normalized = text.strip()
-                        # Convert **text** to <b>text</b>
-                        normalized = re.sub(r'\*\*([^*]+)\*\*', r'<b>\1</b>', normalized)
-                        return normalized
-                    
                     # Compare normalized versions for actual update decision
                     current_normalized = normalize_for_comparison(current_text)
                     new_normalized = normalize_for_comparison(new_text)
@@ -907,117 +1166,63 @@ async def sync_events(channel: str, test_mode: bool = False):
                         stats["identical"] += 1
 
                         # Always update cache (important for rebuilding)
-                        cache.update(TelegramMessage(
-                            message_id=event['telegram_message_id'],
-                            channel=channel,
-                            text=new_text,
-                            image_url=event.get('socials_img_url'),
-                            last_updated=datetime.now(TIMEZONE).isoformat(),
-                            notion_id=event['id'],
-                            event_data={
-                                # Match exact Notion field names
-                                "title": event.get('title', ''),
-                                "event_date": event.get('event_date'),  # YYYY-MM-DD format
-                                "until_date": event.get('until_date'),   # YYYY-MM-DD or null
-                                "event_location": event.get('event_location', ''),
-                                "start_time": event.get('start_time', ''),
-                                "raw_lineup": event.get('raw_lineup', ''),
-                                "event_url": event.get('event_url'),
-                                "facebook_event_url": event.get('facebook_event_url'),
-                                "ticketswap_url": event.get('ticketswap_url'),
-                                "ig_post_url": event.get('ig_post_url'),
-                                "socials_img_url": event.get('socials_img_url')
-                                }
-                            ))
+                        cache.update(_make_cache_entry(event, channel, new_text, now_iso))
 
                         # Only update Notion timestamp if we're doing actual sync, not cache rebuild
                         if reason != "Not in cache (rebuilding)":
-                            update_notion_timestamp(event['id'])
+                            pending_timestamps[event.id] = now_iso
                         continue
 
                     if has_changes or (reason == "Not in cache (rebuilding)" and current_normalized != new_normalized):
                         if reason != "Not in cache (rebuilding)":
                             print("   🔄 Applying changes...")
+                        edits.append((event, new_text))
+
+                # Apply the edits concurrently (text only - images cannot be updated)
+                semaphore = asyncio.Semaphore(TELEGRAM_EDIT_CONCURRENCY)
+
+                async def edit_limited(event, new_text):
+                    async with semaphore:
+                        return await update_telegram_message(client, channel_entity, event.telegram_message_id, new_text)
+
+                # Timestamps of messages that were already identical are known at this point,
+                # so they go to Notion while the edits are in flight
+                results, _ = await asyncio.gather(
+                    asyncio.gather(
+                        *(edit_limited(event, new_text) for event, new_text in edits),
+                        return_exceptions=True
+                    ),
+                    flush_pending_timestamps()
+                )
+
+                for (event, new_text), result in zip(edits, results):
+                    print(f"\n✏️  {event.title} (message {event.telegram_message_id})")
+                    if isinstance(result, Exception):
+                        if "Content of the message was not modified" in str(result):
+                            print("   ℹ️  Message already has this content, updating cache")
+                            stats["identical"] += 1
+
+                            # Update cache anyway
+                            cache.update(_make_cache_entry(event, channel, new_text, now_iso))
+
+                            # Queue Notion timestamp update
+                            pending_timestamps[event.id] = now_iso
+                        else:
+                            print(f"   ❌ Error: {result}")
+                            stats["errors"] += 1
+                    elif result:
+                        print("   ✅ Updated successfully")
+                        stats["updated"] += 1
+
+                        # Update cache
+                        cache.update(_make_cache_entry(event, channel, new_text, now_iso))
+
+                        # Queue Notion timestamp update
+                        pending_timestamps[event.id] = now_iso
+                    else:
+                        print("   ❌ Update failed")
+                        stats["errors"] += 1
 
-                        # Try to update the message (text only - images cannot be updated)
-                        try:
-                            success = await update_telegram_message(
-                                client,
-                                channel,
-                                event['telegram_message_id'],
-                                new_text
-                                # Images cannot be updated in existing Telegram messages
-                            )
-
-                            if success:
-                                print("   ✅ Updated successfully")
-                                stats["updated"] += 1
-
-                                # Update cache
-                                cache.update(TelegramMessage(
-                                message_id=event['telegram_message_id'],
-                                channel=channel,
-                                text=new_text,
-                                image_url=event.get('socials_img_url'),
-                                last_updated=datetime.now(TIMEZONE).isoformat(),
-                                notion_id=event['id'],
-                                event_data={
-                                # Match exact Notion field names
-                                "title": event.get('title', ''),
-                                "event_date": event.get('event_date'),  # YYYY-MM-DD format
-                                "until_date": event.get('until_date'),   # YYYY-MM-DD or null
-                                "event_location": event.get('event_location', ''),
-                                "start_time": event.get('start_time', ''),
-                                "raw_lineup": event.get('raw_lineup', ''),
-                                "event_url": event.get('event_url'),
-                                "facebook_event_url": event.get('facebook_event_url'),
-                                "ticketswap_url": event.get('ticketswap_url'),
-                                "ig_post_url": event.get('ig_post_url'),
-                                "socials_img_url": event.get('socials_img_url')
-                                }
-                            ))
-
-                                # Update Notion timestamp
-                                update_notion_timestamp(event['id'])
-                            else:
-                                print("   ❌ Update failed")
-                                stats["errors"] += 1
-
-                        except Exception as e:
-                            if "Content of the message was not modified" in str(e):
-                                print("   ℹ️  Message already has this content, updating cache")
-                                stats["identical"] += 1
-
-                                # Update cache anyway
-                                cache.update(TelegramMessage(
-                                message_id=event['telegram_message_id'],
-                                channel=channel,
-                                text=new_text,
-                                image_url=event.get('socials_img_url'),
-                                last_updated=datetime.now(TIMEZONE).isoformat(),
-                                notion_id=event['id'],
-                                event_data={
-                                # Match exact Notion field names
-                                "title": event.get('title', ''),
-                                "event_date": event.get('event_date'),  # YYYY-MM-DD format
-                                "until_date": event.get('until_date'),   # YYYY-MM-DD or null
-                                "event_location": event.get('event_location', ''),
-                                "start_time": event.get('start_time', ''),
-                                "raw_lineup": event.get('raw_lineup', ''),
-                                "event_url": event.get('event_url'),
-                                "facebook_event_url": event.get('facebook_event_url'),
-                                "ticketswap_url": event.get('ticketswap_url'),
-                                "ig_post_url": event.get('ig_post_url'),
-                                "socials_img_url": event.get('socials_img_url')
-                                }
-                            ))
-
-                                # Update Notion timestamp
-                                update_notion_timestamp(event['id'])
-                            else:
-                                print(f"   ❌ Error: {e}")
-                                stats["errors"] += 1
-                
                 # Successfully completed all events (end of for loop)
                 break  # Exit retry loop
                 
@@ -1043,9 +1248,20 @@ async def sync_events(channel: str, test_mode: bool = False):
                 log_print(f"\n❌ Unexpected error: {e}", "ERROR")
                 return
 
+    # Write the Notion timestamps queued by the edits (concurrently, within Notion's rate limit)
+    if pending_timestamps:
+        await flush_pending_timestamps()
+    if timestamp_stats["queued"]:
+        print(f"🕒 Updated Notion timestamps: {timestamp_stats['written']}/{timestamp_stats['queued']}")
+
     # Save cache
     if not test_mode:
         cache.save()
+        # Failed events must be retried even if nobody edits them, so only a clean run moves the watermark.
+        # Messages confirmed deleted don't count: retrying can't bring them back, and they would pin every
+        # later run to a full query. Failed fetches and edits are plain errors and do hold it back.
+        if stats["errors"] == stats["deleted"]:
+            save_sync_watermark(channel, run_started)
 
     # Print summary
     print("\n📊 SUMMARY")
@@ -1054,6 +1270,8 @@ async def sync_events(channel: str, test_mode: bool = False):
     print(f"ℹ️  Already identical: {stats['identical']}")
     print(f"⏭️  Skipped: {stats['skipped']}")
     print(f"❌ Errors: {stats['errors']}")
+    if stats["deleted"]:
+        print(f"   🗑️  Of which deleted on Telegram: {stats['deleted']}")
     print(f"📋 Total checked: {stats['checked']}")
 
 